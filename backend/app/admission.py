@@ -0,0 +1,265 @@
+"""Admission control: per-class concurrency limits and per-client rate limits."""
+import asyncio
+import math
+import os
+import time
+from collections import OrderedDict, deque
+from typing import Deque, Dict, Optional, Tuple
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+from app.config import load_phase_config
+from app.database import DB_MAX_OVERFLOW, DB_POOL_SIZE
+from app.metrics import Counter, Gauge, registry
+
+load_phase_config()
+
+# Shed load before it reaches the database pool
+ADMISSION_ENABLED = os.getenv("ADMISSION_ENABLED", "true").lower() == "true"
+# Database connections one task can open; admitted requests must fit in it
+DB_POOL_CAPACITY = DB_POOL_SIZE + DB_MAX_OVERFLOW
+# Requests served at once per route class; more wait in a short queue.
+# Unset limits split the pool so every admitted request gets a connection
+ADMISSION_MAX_IN_FLIGHT_BULK = int(
+    os.getenv("ADMISSION_MAX_IN_FLIGHT_BULK") or max(1, DB_POOL_CAPACITY // 10)
+)
+ADMISSION_MAX_IN_FLIGHT_WRITE = int(
+    os.getenv("ADMISSION_MAX_IN_FLIGHT_WRITE") or max(1, (DB_POOL_CAPACITY - ADMISSION_MAX_IN_FLIGHT_BULK) // 3)
+)
+ADMISSION_MAX_IN_FLIGHT_READ = int(
+    os.getenv("ADMISSION_MAX_IN_FLIGHT_READ")
+    or max(1, DB_POOL_CAPACITY - ADMISSION_MAX_IN_FLIGHT_BULK - ADMISSION_MAX_IN_FLIGHT_WRITE)
+)
+# Requests waiting per class before new ones are rejected with 503
+ADMISSION_MAX_QUEUE = int(os.getenv("ADMISSION_MAX_QUEUE", "50"))
+# Seconds a queued request waits for a slot before it is rejected with 503
+ADMISSION_QUEUE_TIMEOUT = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "1"))
+# Sustained requests per second per client; 0 disables rate limiting
+ADMISSION_CLIENT_RATE = float(os.getenv("ADMISSION_CLIENT_RATE", "20"))
+# Requests a client may send at once before the rate applies
+ADMISSION_CLIENT_BURST = int(os.getenv("ADMISSION_CLIENT_BURST", "40"))
+# Retry-After seconds sent with 503 responses
+ADMISSION_RETRY_AFTER = int(os.getenv("ADMISSION_RETRY_AFTER", "1"))
+
+# Never limited: probes must answer while the task is overloaded, and event
+# streams hold their connection for as long as the client is open
+BYPASS_PATHS = ("/api/health", "/metrics", "/api/memos/stream")
+# Long-running requests get their own small class so they cannot starve the rest
+BULK_PATHS = ("/api/memos/export", "/api/memos/bulk")
+# Client buckets remembered; the least recently seen are forgotten first
+MAX_TRACKED_CLIENTS = 10000
+
+ADMISSION_IN_FLIGHT = registry.register(Gauge(
+    "admission_in_flight",
+    "Requests admitted and being served by route class",
+    ("class",),
+))
+ADMISSION_QUEUE_DEPTH = registry.register(Gauge(
+    "admission_queue_depth",
+    "Requests waiting for admission by route class",
+    ("class",),
+))
+ADMISSION_SHED = registry.register(Counter(
+    "admission_shed_total",
+    "Requests rejected by admission control by route class and reason",
+    ("class", "reason"),
+))
+
+
+def route_class(method: str, path: str) -> Optional[str]:
+    """
+    Classify a request for admission control.
+
+    Returns:
+        "read", "write" or "bulk", or None if the request bypasses admission
+    """
+    if not path.startswith("/api/") or path.startswith(BYPASS_PATHS) or method == "OPTIONS":
+        return None
+    if path.startswith(BULK_PATHS):
+        return "bulk"
+    return "read" if method in ("GET", "HEAD") else "write"
+
+
+def client_key(scope: Scope) -> str:
+    """
+    Identify the client for rate limiting.
+
+    Behind the load balancer the last X-Forwarded-For entry is the address
+    it saw; earlier entries are supplied by the client and not trusted.
+    """
+    for name, value in scope.get("headers", ()):
+        if name == b"x-forwarded-for":
+            return value.decode("latin-1").rsplit(",", 1)[-1].strip()
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+class ConcurrencyLimiter:
+    """Caps in-flight requests, queueing a bounded number FIFO for a bounded time."""
+
+    def __init__(self, name: str, limit: int, max_queue: int, queue_timeout: float):
+        self.name = name
+        self.limit = limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    def _update_metrics(self):
+        ADMISSION_IN_FLIGHT.set(self.name, value=self.in_flight)
+        ADMISSION_QUEUE_DEPTH.set(self.name, value=len(self._waiters))
+
+    async def acquire(self) -> Optional[str]:
+        """
+        Take a slot, waiting in the queue if none is free.
+
+        Returns:
+            None once admitted, or the reason the request was shed
+        """
+        if self.in_flight < self.limit and not self._waiters:
+            self.in_flight += 1
+            self._update_metrics()
+            return None
+        if len(self._waiters) >= self.max_queue:
+            return "queue_full"
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._update_metrics()
+        try:
+            # release() hands its slot straight to the waiter
+            await asyncio.wait_for(waiter, self.queue_timeout)
+            return None
+        except asyncio.TimeoutError:
+            return "queue_timeout"
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+            self._update_metrics()
+
+    def release(self):
+        """Free a slot, passing it to the longest-waiting request if any."""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                self._update_metrics()
+                return
+        self.in_flight -= 1
+        self._update_metrics()
+
+
+class TokenBucketLimiter:
+    """Per-client token buckets refilled at ``rate`` per second up to ``burst``."""
+
+    def __init__(self, rate: float, burst: int, max_clients: int = MAX_TRACKED_CLIENTS):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    def take(self, key: str) -> float:
+        """
+        Take one token for ``key``.
+
+        Returns:
+            0 if allowed, otherwise seconds until a token is available
+        """
+        now = time.monotonic()
+        tokens, updated = self._buckets.pop(key, (float(self.burst), now))
+        tokens = min(float(self.burst), tokens + (now - updated) * self.rate)
+        wait = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            wait = (1 - tokens) / self.rate
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.max_clients:
+            self._buckets.popitem(last=False)
+        return wait
+
+
+def _default_limiters() -> Dict[str, ConcurrencyLimiter]:
+    """
+    Build the per-class limiters from configuration.
+
+    Raises:
+        ValueError: If the limits together exceed the database pool
+    """
+    limits = {
+        "read": ADMISSION_MAX_IN_FLIGHT_READ,
+        "write": ADMISSION_MAX_IN_FLIGHT_WRITE,
+        "bulk": ADMISSION_MAX_IN_FLIGHT_BULK,
+    }
+    total = sum(limits.values())
+    if total > DB_POOL_CAPACITY:
+        raise ValueError(
+            f"ADMISSION_MAX_IN_FLIGHT_READ/WRITE/BULK add up to {total}, more than the "
+            f"{DB_POOL_CAPACITY} database connections of DB_POOL_SIZE + DB_MAX_OVERFLOW"
+        )
+    return {
+        name: ConcurrencyLimiter(name, limit, ADMISSION_MAX_QUEUE, ADMISSION_QUEUE_TIMEOUT)
+        for name, limit in limits.items()
+    }
+
+
+class AdmissionMiddleware:
+    """
+    Rejects API requests early instead of letting them pile up on the pool.
+
+    Clients over their rate get 429 and overloaded route classes 503, both
+    with Retry-After. Health checks, /metrics and event streams bypass it.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        limiters: Optional[Dict[str, ConcurrencyLimiter]] = None,
+        client_rate: float = ADMISSION_CLIENT_RATE,
+        client_burst: int = ADMISSION_CLIENT_BURST,
+        retry_after: int = ADMISSION_RETRY_AFTER,
+    ):
+        self.app = app
+        self.limiters = limiters if limiters is not None else _default_limiters()
+        self.rate_limiter = TokenBucketLimiter(client_rate, client_burst) if client_rate > 0 else None
+        self.retry_after = retry_after
+
+    async def _reject(self, scope: Scope, receive: Receive, send: Send, status: int, retry_after: int):
+        detail = "Too many requests" if status == 429 else "Server is busy, retry later"
+        response = JSONResponse(
+            {"detail": detail}, status_code=status, headers={"Retry-After": str(retry_after)}
+        )
+        await response(scope, receive, send)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        request_class = route_class(scope.get("method", ""), scope["path"]) if scope["type"] == "http" else None
+        if request_class is None:
+            await self.app(scope, receive, send)
+            return
+
+        if self.rate_limiter is not None:
+            wait = self.rate_limiter.take(client_key(scope))
+            if wait:
+                ADMISSION_SHED.inc(request_class, "rate_limited")
+                await self._reject(scope, receive, send, 429, max(1, math.ceil(wait)))
+                return
+
+        limiter = self.limiters.get(request_class)
+        if limiter is None:
+            await self.app(scope, receive, send)
+            return
+        reason = await limiter.acquire()
+        if reason is not None:
+            ADMISSION_SHED.inc(request_class, reason)
+            await self._reject(scope, receive, send, 503, self.retry_after)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release()
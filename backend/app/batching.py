@@ -0,0 +1,116 @@
+"""Coalesces concurrent writes into one statement and transaction."""
+import asyncio
+import os
+from typing import Callable, Generic, List, Optional, Set, TypeVar, Union
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from app.config import load_phase_config
+from app.database import run_db
+
+load_phase_config()
+
+# Batch single memo creates instead of committing each one separately
+MEMO_WRITE_BATCHING = os.getenv("MEMO_WRITE_BATCHING", "false").lower() == "true"
+# How long the first create in a batch waits for others to join
+MEMO_WRITE_BATCH_WINDOW_MS = float(os.getenv("MEMO_WRITE_BATCH_WINDOW_MS", "5"))
+# A batch is written as soon as it holds this many creates
+MEMO_WRITE_BATCH_MAX_SIZE = int(os.getenv("MEMO_WRITE_BATCH_MAX_SIZE", "100"))
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class _Batch:
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.items: List = []
+        self.futures: List[asyncio.Future] = []
+        self.full = asyncio.Event()
+
+
+class WriteBatcher(Generic[T, R]):
+    """
+    Collects items submitted within ``window`` seconds, up to ``max_size``,
+    and writes them with one ``write_many`` call in one transaction.
+
+    Batches are written in their own session, so a caller that goes away
+    does not strand the others. If the batch fails, items are retried one
+    by one with ``write_one`` so a bad item only fails its own caller.
+    """
+
+    def __init__(
+        self,
+        write_many: Callable[[Session, List[T]], List[R]],
+        write_one: Callable[[Session, T], R],
+        session_factory: Callable[[], Session],
+        max_size: int = MEMO_WRITE_BATCH_MAX_SIZE,
+        window: float = MEMO_WRITE_BATCH_WINDOW_MS / 1000,
+    ):
+        self.write_many = write_many
+        self.write_one = write_one
+        self.session_factory = session_factory
+        self.max_size = max_size
+        self.window = window
+        self.batches = 0
+        self.items = 0
+        self.fallbacks = 0
+        self._pending: Optional[_Batch] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def submit(self, item: T) -> R:
+        """Queue ``item`` for the next batch and wait for its own result."""
+        loop = asyncio.get_running_loop()
+        batch = self._pending
+        if batch is None or batch.loop is not loop:
+            batch = self._pending = _Batch(loop)
+            task = loop.create_task(self._flush(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        future = loop.create_future()
+        batch.items.append(item)
+        batch.futures.append(future)
+        if len(batch.items) >= self.max_size:
+            self._pending = None
+            batch.full.set()
+        return await future
+
+    async def _flush(self, batch: _Batch):
+        try:
+            await asyncio.wait_for(batch.full.wait(), self.window)
+        except asyncio.TimeoutError:
+            pass
+        if self._pending is batch:
+            self._pending = None
+        try:
+            results = await run_db(self._write, batch.items)
+        except Exception as e:
+            results = [e] * len(batch.items)
+        for future, result in zip(batch.futures, results):
+            if future.done():
+                # The caller was cancelled; its item was still written
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def _write(self, items: List[T]) -> List[Union[R, Exception]]:
+        with self.session_factory() as db:
+            try:
+                results = self.write_many(db, items)
+                self.batches += 1
+                self.items += len(items)
+                return results
+            except SQLAlchemyError:
+                db.rollback()
+                if len(items) == 1:
+                    raise
+            self.fallbacks += 1
+            results: List[Union[R, Exception]] = []
+            for item in items:
+                try:
+                    results.append(self.write_one(db, item))
+                except SQLAlchemyError as e:
+                    db.rollback()
+                    results.append(e)
+            return results
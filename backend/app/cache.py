@@ -0,0 +1,219 @@
+"""Response cache for memo reads with pluggable backends."""
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Optional, Set, Tuple, TypeVar
+from app.config import load_phase_config
+
+load_phase_config()
+
+# Cache backend and sizing, configurable per phase; a size of 0 disables caching
+MEMO_CACHE_BACKEND = os.getenv("MEMO_CACHE_BACKEND", "memory").lower()
+MEMO_CACHE_SIZE = int(os.getenv("MEMO_CACHE_SIZE", "1024"))
+MEMO_CACHE_TTL = float(os.getenv("MEMO_CACHE_TTL", "30"))
+MEMO_CACHE_REDIS_URL = os.getenv("MEMO_CACHE_REDIS_URL", "redis://localhost:6379/0")
+# TTL for responses read from a replica, which may lag behind invalidations;
+# bounds how long a page older than the last write can be served
+MEMO_CACHE_REPLICA_TTL = float(os.getenv("MEMO_CACHE_REPLICA_TTL", "2"))
+
+T = TypeVar("T")
+
+
+class CacheBackend:
+    """
+    Interface for memo response caches.
+
+    Values are pre-serialized response bodies. Each entry carries tags
+    (e.g. the ids of the memos it contains) so writes can drop exactly the
+    entries they affect.
+    """
+
+    name = "base"
+    # Entries live outside this process and are shared by every task
+    shared = False
+
+    def generation(self) -> int:
+        """
+        Return the current invalidation generation.
+
+        Take this before reading from the database and pass it to
+        :meth:`set`, so a result computed before a concurrent write is
+        never stored after that write invalidated it.
+        """
+        raise NotImplementedError
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the cached value for ``key``, or None on a miss."""
+        raise NotImplementedError
+
+    def set(
+        self,
+        key: str,
+        value: bytes,
+        tags: Iterable[str] = (),
+        generation: Optional[int] = None,
+        ttl: Optional[float] = None,
+    ):
+        """
+        Store ``value`` under ``key``, tagged for later invalidation.
+
+        Args:
+            key: Cache key
+            value: Serialized response body
+            tags: Tags that invalidate this entry
+            generation: Value of :meth:`generation` taken before the read
+            ttl: Seconds to keep this entry, if shorter than the backend's TTL
+        """
+        raise NotImplementedError
+
+    def invalidate_tags(self, tags: Iterable[str]):
+        """Drop every entry carrying any of ``tags``."""
+        raise NotImplementedError
+
+    def clear(self):
+        """Drop every entry."""
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot hit/miss counters and occupancy."""
+        raise NotImplementedError
+
+    async def _run(self, func: Callable[..., T], *args: Any) -> T:
+        """Run a cache operation from async code; in-process backends run it inline."""
+        return func(*args)
+
+    async def aget(self, key: str) -> Optional[bytes]:
+        """Async :meth:`get` that never blocks the event loop."""
+        return await self._run(self.get, key)
+
+    async def ageneration(self) -> int:
+        """Async :meth:`generation` that never blocks the event loop."""
+        return await self._run(self.generation)
+
+    async def aset(
+        self,
+        key: str,
+        value: bytes,
+        tags: Iterable[str] = (),
+        generation: Optional[int] = None,
+        ttl: Optional[float] = None,
+    ):
+        """Async :meth:`set` that never blocks the event loop."""
+        await self._run(self.set, key, value, tuple(tags), generation, ttl)
+
+    async def ainvalidate_tags(self, tags: Iterable[str]):
+        """Async :meth:`invalidate_tags` that never blocks the event loop."""
+        await self._run(self.invalidate_tags, tuple(tags))
+
+
+class MemoryCache(CacheBackend):
+    """Bounded in-process LRU cache with a TTL."""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[bytes, float, Tuple[str, ...]]]" = OrderedDict()
+        self._tags: Dict[str, Set[str]] = {}
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires_at, _ = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(
+        self,
+        key: str,
+        value: bytes,
+        tags: Iterable[str] = (),
+        generation: Optional[int] = None,
+        ttl: Optional[float] = None,
+    ):
+        if self.max_entries <= 0:
+            return
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        tags = tuple(tags)
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, time.monotonic() + ttl, tags)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate_tags(self, tags: Iterable[str]):
+        with self._lock:
+            self._generation += 1
+            for tag in tags:
+                for key in list(self._tags.get(tag, ())):
+                    self._remove(key)
+                    self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._tags.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "backend": self.name,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl,
+            }
+
+    def _remove(self, key: str):
+        """Remove ``key`` and its tag references; caller holds the lock."""
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+def create_cache() -> CacheBackend:
+    """Build the cache backend selected by ``MEMO_CACHE_BACKEND``."""
+    if MEMO_CACHE_BACKEND == "redis":
+        from app.redis_cache import RedisCache
+        return RedisCache(MEMO_CACHE_REDIS_URL, MEMO_CACHE_TTL)
+    if MEMO_CACHE_BACKEND != "memory":
+        raise ValueError(
+            f"Unknown MEMO_CACHE_BACKEND '{MEMO_CACHE_BACKEND}'. Expected: memory, redis"
+        )
+    return MemoryCache(MEMO_CACHE_SIZE, MEMO_CACHE_TTL)
+
+
+memo_cache = create_cache()
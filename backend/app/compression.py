@@ -0,0 +1,223 @@
+"""Negotiated gzip/brotli response compression."""
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Dict, Optional, Sequence, Tuple
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+# Content types whose bodies must reach the client unbuffered
+UNCOMPRESSED_TYPES = ("text/event-stream",)
+# Encodings are only worth it for text-like payloads
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "text/",
+    "image/svg+xml",
+)
+
+
+def accepted_encodings(accept_encoding: str) -> Dict[str, float]:
+    """
+    Parse an Accept-Encoding header into coding weights.
+
+    Args:
+        accept_encoding: Raw Accept-Encoding header value
+
+    Returns:
+        Mapping of lowercased coding (including "*") to its q-value
+    """
+    weights = {}
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if coding:
+            weights[coding] = q
+    return weights
+
+
+def negotiate_encoding(accept_encoding: str, available: Sequence[str] = ()) -> Optional[str]:
+    """
+    Pick the best content coding from an Accept-Encoding header.
+
+    Args:
+        accept_encoding: Raw Accept-Encoding header value
+        available: Codings to choose from, in order of preference; defaults
+            to those this process can produce
+
+    Returns:
+        The chosen coding, or None for identity
+    """
+    weights = accepted_encodings(accept_encoding)
+    wildcard = weights.get("*", 0.0)
+    if not available:
+        available = ("br", "gzip") if brotli is not None else ("gzip",)
+    best, best_q = None, 0.0
+    for coding in available:
+        q = weights.get(coding, wildcard)
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+class _Compressor:
+    """Incremental compressor for one response body."""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        self.encoding = encoding
+        if encoding == "br":
+            self._br = brotli.Compressor(quality=brotli_quality)
+        else:
+            self._gz = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        if self.encoding == "br":
+            out = self._br.process(data)
+            return out + (self._br.finish() if final else self._br.flush())
+        out = self._gz.compress(data)
+        return out + self._gz.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+class CompressionMiddleware:
+    """
+    Compress responses with brotli or gzip according to Accept-Encoding.
+
+    Bodies under ``minimum_size`` and responses that already carry a
+    Content-Encoding are passed through. Streaming responses are
+    compressed chunk by chunk. Complete bodies with a strong ETag are
+    memoized per encoding, so repeated responses are compressed once.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        memo_entries: int = 256,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.memo_entries = memo_entries
+        self._memo: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+        self._memo_lock = threading.Lock()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await _CompressionResponder(self, encoding)(scope, receive, send)
+
+    def memo_get(self, etag: str, encoding: str) -> Optional[bytes]:
+        with self._memo_lock:
+            value = self._memo.get((etag, encoding))
+            if value is not None:
+                self._memo.move_to_end((etag, encoding))
+            return value
+
+    def memo_set(self, etag: str, encoding: str, value: bytes):
+        if self.memo_entries <= 0:
+            return
+        with self._memo_lock:
+            self._memo[(etag, encoding)] = value
+            while len(self._memo) > self.memo_entries:
+                self._memo.popitem(last=False)
+
+
+class _CompressionResponder:
+    """Per-request state for :class:`CompressionMiddleware`."""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.send: Send = None
+        self.start_message: Optional[Message] = None
+        self.passthrough = False
+        self.compressor: Optional[_Compressor] = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        self.send = send
+        await self.middleware.app(scope, receive, self.send_wrapper)
+
+    def _should_compress(self, headers: Headers) -> bool:
+        if "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "")
+        if content_type.startswith(UNCOMPRESSED_TYPES):
+            return False
+        return content_type.startswith(COMPRESSIBLE_TYPES)
+
+    def _mark_encoded(self, headers: MutableHeaders):
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        # The compressed representation differs byte-wise from the original
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["ETag"] = "W/" + etag
+
+    async def send_wrapper(self, message: Message):
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.compressor is None:
+            headers = MutableHeaders(raw=self.start_message["headers"])
+            if not self._should_compress(headers) or (
+                not more_body and len(body) < self.middleware.minimum_size
+            ):
+                self.passthrough = True
+                await self.send(self.start_message)
+                await self.send(message)
+                return
+
+            if not more_body:
+                etag = headers.get("etag")
+                compressed = None
+                if etag and not etag.startswith("W/"):
+                    compressed = self.middleware.memo_get(etag, self.encoding)
+                if compressed is None:
+                    compressed = _Compressor(
+                        self.encoding, self.middleware.gzip_level, self.middleware.brotli_quality
+                    ).compress(body, final=True)
+                    if etag and not etag.startswith("W/"):
+                        self.middleware.memo_set(etag, self.encoding, compressed)
+                self._mark_encoded(headers)
+                headers["Content-Length"] = str(len(compressed))
+                await self.send(self.start_message)
+                await self.send({"type": "http.response.body", "body": compressed})
+                return
+
+            self.compressor = _Compressor(
+                self.encoding, self.middleware.gzip_level, self.middleware.brotli_quality
+            )
+            self._mark_encoded(headers)
+            if "content-length" in headers:
+                del headers["Content-Length"]
+            await self.send(self.start_message)
+
+        chunk = self.compressor.compress(body, final=not more_body)
+        await self.send({"type": "http.response.body", "body": chunk, "more_body": more_body})
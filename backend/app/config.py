@@ -0,0 +1,26 @@
+"""Phase configuration loading."""
+import os
+from functools import lru_cache
+from dotenv import load_dotenv
+
+CONFIG_DIR = os.path.join(os.path.dirname(__file__), "../../config")
+
+
+@lru_cache(maxsize=None)
+def load_phase_config() -> str:
+    """
+    Load ``config/config.{PHASE}.env`` into the environment, once per process.
+
+    Falls back to the local config if the phase file doesn't exist. Modules
+    that read settings at import time call this first, so the result does
+    not depend on import order.
+
+    Returns:
+        The active phase name
+    """
+    phase = os.getenv("PHASE", "local")
+    config_path = os.path.join(CONFIG_DIR, f"config.{phase}.env")
+    if not os.path.exists(config_path):
+        config_path = os.path.join(CONFIG_DIR, "config.local.env")
+    load_dotenv(dotenv_path=config_path)
+    return phase
@@ -0,0 +1,251 @@
+"""Memo change events, fanned out to clients over Server-Sent Events."""
+import asyncio
+import json
+import os
+import threading
+from collections import deque
+from typing import AsyncIterator, Callable, Deque, List, NamedTuple, Optional, Sequence, Set, Tuple
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+from app.config import load_phase_config
+from app.invalidation import NotificationListener
+from app.metrics import Counter, Gauge, registry
+from app.models import EVENT_SEQUENCE, Memo, memo_summary_columns
+from app.schemas import MEMO_PREVIEW_LENGTH, MemoSummary
+
+load_phase_config()
+
+CHANNEL = "memo_events"
+# Publish memo changes and serve GET /api/memos/stream
+MEMO_EVENTS_ENABLED = os.getenv("MEMO_EVENTS_ENABLED", "true").lower() == "true"
+# Recent events kept per task so reconnecting clients can resume
+MEMO_EVENTS_BUFFER_SIZE = int(os.getenv("MEMO_EVENTS_BUFFER_SIZE", "1000"))
+# Comment lines sent on idle streams so proxies keep the connection open
+MEMO_EVENTS_KEEPALIVE = float(os.getenv("MEMO_EVENTS_KEEPALIVE", "15"))
+# Events queued for one client before it is told to reset instead
+MEMO_EVENTS_QUEUE_SIZE = 256
+# Client reconnect delay sent in the stream's retry field
+RETRY_MS = 3000
+# Keeps each NOTIFY payload well under Postgres' 8000 byte limit
+MAX_IDS_PER_EVENT = 500
+
+
+class MemoEvent(NamedTuple):
+    """One event as sent to clients; ``data`` is pre-serialized JSON."""
+
+    id: Optional[int]
+    type: str
+    data: str
+
+    def encode(self) -> str:
+        """Format as a Server-Sent Events message."""
+        lines = [] if self.id is None else [f"id: {self.id}"]
+        lines += [f"event: {self.type}", f"data: {self.data}"]
+        return "\n".join(lines) + "\n\n"
+
+
+# Tells clients their view may be stale and the list must be reloaded
+RESET_EVENT = MemoEvent(None, "reset", "{}")
+
+
+def publish_memo_event(db: Session, event_type: str, memo_ids: Sequence[int]):
+    """
+    Queue a memo change notice for every task's event stream.
+
+    Must be called inside the write transaction; Postgres delivers the
+    notification only if and when that transaction commits. Event ids come
+    from a database sequence, so they are the same on every task.
+
+    Args:
+        db: Session holding the write transaction
+        event_type: "created" or "deleted"
+        memo_ids: Ids of the affected memos
+    """
+    if not MEMO_EVENTS_ENABLED or not memo_ids:
+        return
+    memo_ids = list(memo_ids)
+    for start in range(0, len(memo_ids), MAX_IDS_PER_EVENT):
+        db.execute(
+            text(
+                "SELECT pg_notify(:channel, json_build_object("
+                "'id', nextval(:sequence), 'type', :type, 'ids', CAST(:ids AS integer[]))::text)"
+            ),
+            {
+                "channel": CHANNEL,
+                "sequence": EVENT_SEQUENCE,
+                "type": event_type,
+                "ids": memo_ids[start:start + MAX_IDS_PER_EVENT],
+            }
+        )
+
+
+class _Subscriber:
+    """One connected client; its queue lives on the client's event loop."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, queue_size: int):
+        self.loop = loop
+        self.queue: "asyncio.Queue[MemoEvent]" = asyncio.Queue(maxsize=queue_size)
+        self.overflowed = False
+
+    def deliver(self, event: MemoEvent):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+
+class MemoEventBroker:
+    """
+    Fans events from one database listener out to many stream clients.
+
+    Keeps a ring buffer of recent events in delivery order, which is commit
+    order and so the same on every task, for Last-Event-ID resumption.
+    """
+
+    def __init__(
+        self,
+        buffer_size: int = MEMO_EVENTS_BUFFER_SIZE,
+        queue_size: int = MEMO_EVENTS_QUEUE_SIZE,
+    ):
+        self.queue_size = queue_size
+        self._buffer: Deque[MemoEvent] = deque(maxlen=buffer_size)
+        self._subscribers: Set[_Subscriber] = set()
+        self._lock = threading.Lock()
+        self.published = 0
+
+    @property
+    def client_count(self) -> int:
+        return len(self._subscribers)
+
+    def _broadcast(self, subscribers: List[_Subscriber], event: MemoEvent):
+        for subscriber in subscribers:
+            try:
+                subscriber.loop.call_soon_threadsafe(subscriber.deliver, event)
+            except RuntimeError:
+                # The client's event loop has closed
+                self.unsubscribe(subscriber)
+
+    def publish(self, event: MemoEvent):
+        """Buffer ``event`` and deliver it to every client; thread-safe."""
+        with self._lock:
+            self._buffer.append(event)
+            self.published += 1
+            subscribers = list(self._subscribers)
+        self._broadcast(subscribers, event)
+
+    def reset(self):
+        """Forget buffered events and tell clients to reload, e.g. after missed notices."""
+        with self._lock:
+            self._buffer.clear()
+            subscribers = list(self._subscribers)
+        self._broadcast(subscribers, RESET_EVENT)
+
+    def subscribe(self, last_event_id: Optional[str] = None) -> Tuple[_Subscriber, List[MemoEvent]]:
+        """
+        Register a client on the running event loop.
+
+        Args:
+            last_event_id: Id of the last event the client received, if resuming
+
+        Returns:
+            The subscriber and the events it missed, or a reset event if the
+            missed events are no longer buffered
+        """
+        subscriber = _Subscriber(asyncio.get_running_loop(), self.queue_size)
+        with self._lock:
+            self._subscribers.add(subscriber)
+            if not last_event_id:
+                return subscriber, []
+            buffered = list(self._buffer)
+        for index, event in enumerate(buffered):
+            if str(event.id) == last_event_id.strip():
+                return subscriber, buffered[index + 1:]
+        return subscriber, [RESET_EVENT]
+
+    def unsubscribe(self, subscriber: _Subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    async def stream(
+        self, last_event_id: Optional[str] = None, keepalive: float = MEMO_EVENTS_KEEPALIVE
+    ) -> AsyncIterator[str]:
+        """Yield Server-Sent Events messages for one client until it disconnects."""
+        subscriber, missed = self.subscribe(last_event_id)
+        try:
+            yield f"retry: {RETRY_MS}\n\n"
+            for event in missed:
+                yield event.encode()
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscriber.queue.get(), keepalive)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if subscriber.overflowed:
+                    # The client fell behind; drop the backlog and have it reload
+                    while not subscriber.queue.empty():
+                        subscriber.queue.get_nowait()
+                    subscriber.overflowed = False
+                    event = RESET_EVENT
+                yield event.encode()
+        finally:
+            self.unsubscribe(subscriber)
+
+
+class MemoEventListener(NotificationListener):
+    """Turns memo change notices into stream events, loading created memo summaries once per task."""
+
+    channel = CHANNEL
+    thread_name = "memo-events"
+
+    def __init__(
+        self,
+        dsn: str,
+        broker: MemoEventBroker,
+        session_factory: Callable[[], Session],
+        poll_interval: float = 5.0,
+    ):
+        super().__init__(dsn, poll_interval)
+        self.broker = broker
+        self.session_factory = session_factory
+
+    def on_connect(self):
+        # Events sent while disconnected were lost; clients must reload
+        self.broker.reset()
+
+    def _load_memos(self, memo_ids: List[int]) -> List[dict]:
+        with self.session_factory() as db:
+            rows = db.execute(
+                select(*memo_summary_columns(MEMO_PREVIEW_LENGTH))
+                .where(Memo.id.in_(memo_ids))
+                .order_by(Memo.created_at.desc(), Memo.id.desc())
+            )
+            return [MemoSummary.model_validate(row).model_dump(mode="json") for row in rows]
+
+    def on_notify(self, payload: str):
+        try:
+            message = json.loads(payload)
+            event_id, event_type, memo_ids = message["id"], message["type"], message["ids"]
+        except (ValueError, KeyError):
+            return
+        self.received += 1
+        if event_type == "created":
+            data = {"memos": self._load_memos(memo_ids)}
+        else:
+            data = {"ids": memo_ids}
+        self.broker.publish(MemoEvent(event_id, event_type, json.dumps(data, ensure_ascii=False)))
+
+
+memo_events = MemoEventBroker()
+
+
+def _collect_event_metrics() -> List:
+    """Expose event stream client and fan-out counts as metrics."""
+    event_clients = Gauge("memo_events_clients", "Connected memo event stream clients")
+    event_clients.set(value=memo_events.client_count)
+    events_published = Counter("memo_events_published_total", "Memo change events fanned out to clients")
+    events_published.inc(amount=memo_events.published)
+    return [event_clients, events_published]
+
+
+registry.register_collector(_collect_event_metrics)
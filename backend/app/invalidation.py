@@ -0,0 +1,150 @@
+"""Cross-task cache invalidation over Postgres LISTEN/NOTIFY."""
+import json
+import os
+import select
+import threading
+import uuid
+from typing import List, Optional, Sequence
+import psycopg2
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from app.cache import CacheBackend
+
+CHANNEL = "memo_cache_invalidate"
+# Broadcast invalidations to every task sharing the database
+MEMO_CACHE_BROADCAST = os.getenv("MEMO_CACHE_BROADCAST", "false").lower() == "true"
+# Identifies this process so it can ignore its own notifications
+ORIGIN = uuid.uuid4().hex
+# Postgres caps NOTIFY payloads at 8000 bytes
+MAX_PAYLOAD_BYTES = 7500
+
+
+def _payloads(tags: Sequence[str]) -> List[str]:
+    """Split tags into NOTIFY payloads that stay under the size limit."""
+    payloads, chunk, size = [], [], 0
+    for tag in tags:
+        if chunk and size + len(tag) + 4 > MAX_PAYLOAD_BYTES:
+            payloads.append(json.dumps({"origin": ORIGIN, "tags": chunk}))
+            chunk, size = [], 0
+        chunk.append(tag)
+        size += len(tag) + 4
+    if chunk:
+        payloads.append(json.dumps({"origin": ORIGIN, "tags": chunk}))
+    return payloads
+
+
+def publish_invalidation(db: Session, tags: Sequence[str]):
+    """
+    Queue a cache invalidation notice for other tasks.
+
+    Must be called inside the write transaction; Postgres delivers the
+    notification only if and when that transaction commits.
+
+    Args:
+        db: Session holding the write transaction
+        tags: Cache tags affected by the write
+    """
+    if not MEMO_CACHE_BROADCAST or not tags:
+        return
+    for payload in _payloads(tags):
+        db.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": CHANNEL, "payload": payload}
+        )
+
+
+class NotificationListener:
+    """
+    Background thread receiving Postgres notifications on one channel.
+
+    Reconnects with backoff; subclasses handle payloads in :meth:`on_notify`
+    and resynchronize in :meth:`on_connect`, since notices sent while
+    disconnected are lost.
+    """
+
+    channel = ""
+    thread_name = "pg-listener"
+
+    def __init__(self, dsn: str, poll_interval: float = 5.0):
+        self.dsn = dsn
+        self.poll_interval = poll_interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.received = 0
+
+    def start(self):
+        """Start listening in a daemon thread."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=self.thread_name, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop listening and wait for the thread to exit."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_interval + 1)
+            self._thread = None
+
+    def on_connect(self):
+        """Called after (re)subscribing."""
+
+    def on_notify(self, payload: str):
+        """Called for each notification payload."""
+        raise NotImplementedError
+
+    def _run(self):
+        backoff = 1.0
+        while not self._stop.is_set():
+            try:
+                conn = psycopg2.connect(self.dsn)
+            except psycopg2.Error as e:
+                print(f"⚠️  Listener on '{self.channel}' cannot connect: {e}")
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, 30.0)
+                continue
+            try:
+                conn.autocommit = True
+                with conn.cursor() as cur:
+                    cur.execute(f"LISTEN {self.channel}")
+                self.on_connect()
+                backoff = 1.0
+                while not self._stop.is_set():
+                    if select.select([conn], [], [], self.poll_interval) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        self.on_notify(conn.notifies.pop(0).payload)
+            except (psycopg2.Error, OSError) as e:
+                print(f"⚠️  Listener on '{self.channel}' disconnected: {e}")
+            finally:
+                conn.close()
+
+
+class InvalidationListener(NotificationListener):
+    """Background thread applying invalidation notices to a local cache."""
+
+    channel = CHANNEL
+    thread_name = "cache-invalidation"
+
+    def __init__(self, dsn: str, cache: CacheBackend, poll_interval: float = 5.0):
+        super().__init__(dsn, poll_interval)
+        self.cache = cache
+
+    def on_connect(self):
+        # Notices sent while disconnected were lost, so start clean. A shared
+        # cache was invalidated by the writing task itself; clearing it here
+        # would empty it for the whole fleet on every reconnect
+        if not self.cache.shared:
+            self.cache.clear()
+
+    def on_notify(self, payload: str):
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            return
+        if message.get("origin") == ORIGIN or self.cache.shared:
+            return
+        self.received += 1
+        self.cache.invalidate_tags(message.get("tags", []))
@@ -1,23 +1,43 @@
 """Main FastAPI application."""
 import os
-from fastapi import FastAPI
+# Imported first so its import timestamp covers the imports below
+from app.startup import IMPORT_STARTED, StartupTimer
+from functools import lru_cache
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
-from dotenv import load_dotenv
-from app.routers import health, memos
-from app.database import init_db
-
-# Load environment variables - check PHASE first
-PHASE = os.getenv("PHASE", "local")
-config_file = f"config/config.{PHASE}.env"
-load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), f"../../{config_file}"))
-# Fallback to local if phase config doesn't exist
-if not os.path.exists(os.path.join(os.path.dirname(__file__), f"../../{config_file}")):
-    load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), "../../config/config.local.env"))
+from app.config import load_phase_config
+from app.routers import health, memos, metrics
+from app.admission import ADMISSION_ENABLED, AdmissionMiddleware
+from app.compression import CompressionMiddleware
+from app.metrics import MetricsMiddleware
+from app.profiling import SQLProfilingMiddleware
+from app.cache import memo_cache
+from app.database import (
+    DB_MIGRATE_ON_STARTUP,
+    DatabaseSettings,
+    SessionLocal,
+    get_database_url,
+    get_engine,
+    init_db,
+    on_credentials_rotated,
+)
+from app.events import MEMO_EVENTS_ENABLED, MemoEventListener, memo_events
+from app.invalidation import MEMO_CACHE_BROADCAST, InvalidationListener
+from app.purge import MEMO_PURGE_ENABLED, memo_purger
+from app.secrets import aws_secrets_enabled, get_secret_provider
+from app.static import PrecompressedStaticFiles, SPAIndex
+
+# Load environment variables for the current PHASE
+PHASE = load_phase_config()
 
 # Get frontend domain from config
 FRONTEND_DOMAIN = os.getenv("FRONTEND_DOMAIN", "http://localhost:8500")
+# Responses smaller than this are sent uncompressed
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+# Profile every request: log each statement and report totals in Server-Timing
+SQL_PROFILE_ENABLED = os.getenv("SQL_PROFILE_ENABLED", "false").lower() == "true"
+# Allow clients to profile a single request by sending "X-SQL-Profile: 1"
+SQL_PROFILE_HEADER_ENABLED = os.getenv("SQL_PROFILE_HEADER_ENABLED", "false").lower() == "true"
 
 app = FastAPI(
     title="Memo API",
@@ -34,41 +54,125 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Negotiated brotli/gzip compression for API and static responses
+app.add_middleware(CompressionMiddleware, minimum_size=COMPRESSION_MIN_SIZE)
+
+# Per-request SQL accounting, slow-query log and opt-in Server-Timing header
+app.add_middleware(
+    SQLProfilingMiddleware,
+    profile_all=SQL_PROFILE_ENABLED,
+    allow_header=SQL_PROFILE_HEADER_ENABLED,
+)
+
+# In-flight limits per route class and per-client rate limits; inside the
+# metrics middleware so shed requests still show up in request metrics
+if ADMISSION_ENABLED:
+    app.add_middleware(AdmissionMiddleware)
+
+# Per-route latency and in-flight metrics, served at /metrics
+app.add_middleware(MetricsMiddleware)
+
 # Include API routers
 app.include_router(health.router)
 app.include_router(memos.router)
+app.include_router(metrics.router)
 
 # Serve static files from frontend build directory
 static_dir = os.path.join(os.path.dirname(__file__), "../../frontend/dist")
+spa_index = SPAIndex(os.path.join(static_dir, "index.html"))
 if os.path.exists(static_dir):
-    # Mount static files (JS, CSS, images, etc.)
-    app.mount("/assets", StaticFiles(directory=os.path.join(static_dir, "assets")), name="assets")
-    
+    # Mount hashed build assets (JS, CSS, images, etc.) with long-lived caching
+    app.mount(
+        "/assets",
+        PrecompressedStaticFiles(directory=os.path.join(static_dir, "assets")),
+        name="assets",
+    )
+
     # Serve index.html for root path
     @app.get("/")
-    async def serve_root():
+    async def serve_root(request: Request):
         """Serve React app for root path."""
-        index_path = os.path.join(static_dir, "index.html")
-        if os.path.exists(index_path):
-            return FileResponse(index_path)
+        response = spa_index.response(request.headers)
+        if response is not None:
+            return response
         return {"detail": "Frontend not built"}
-    
+
     # Serve index.html for all non-API routes (SPA routing)
     @app.get("/{full_path:path}")
-    async def serve_spa(full_path: str):
+    async def serve_spa(full_path: str, request: Request):
         """Serve React app for all non-API routes."""
         # Don't serve index.html for API routes
         if full_path.startswith("api/"):
             return {"detail": "Not found"}
-        
-        index_path = os.path.join(static_dir, "index.html")
-        if os.path.exists(index_path):
-            return FileResponse(index_path)
+
+        response = spa_index.response(request.headers)
+        if response is not None:
+            return response
         return {"detail": "Frontend not built"}
 
 
+@lru_cache(maxsize=None)
+def get_invalidation_listener() -> InvalidationListener:
+    """Create the cache invalidation listener on first use."""
+    return InvalidationListener(get_database_url(), memo_cache)
+
+
+@lru_cache(maxsize=None)
+def get_memo_event_listener() -> MemoEventListener:
+    """Create the listener feeding GET /api/memos/stream on first use."""
+    return MemoEventListener(
+        get_database_url(), memo_events, lambda: SessionLocal(bind=get_engine())
+    )
+
+
+def _follow_rotated_credentials(settings: DatabaseSettings):
+    """Point background workers at the database with rotated credentials."""
+    health.get_readiness_probe().retarget(settings.url, get_engine().pool)
+    # An established LISTEN connection stays valid; only reconnects need the new URL
+    get_invalidation_listener().dsn = settings.url
+    get_memo_event_listener().dsn = settings.url
+
+
+on_credentials_rotated(_follow_rotated_credentials)
+
+startup_timer = StartupTimer()
+startup_timer.mark("import", IMPORT_STARTED)
+
+
 @app.on_event("startup")
 async def startup_event():
-    """Initialize database on startup."""
-    init_db()
+    """Verify the schema version and load the SPA index on startup."""
+    with startup_timer.phase("credentials"):
+        get_database_url()
+    with startup_timer.phase("engine"):
+        get_engine()
+    with startup_timer.phase("schema"):
+        init_db(apply_pending=DB_MIGRATE_ON_STARTUP)
+    with startup_timer.phase("spa"):
+        spa_index.load()
+    with startup_timer.phase("workers"):
+        health.get_readiness_probe().start()
+        if MEMO_CACHE_BROADCAST:
+            get_invalidation_listener().start()
+        if MEMO_EVENTS_ENABLED:
+            get_memo_event_listener().start()
+        if MEMO_PURGE_ENABLED:
+            memo_purger.start()
+        if aws_secrets_enabled():
+            get_secret_provider().start()
+    print(startup_timer.report())
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background workers on shutdown."""
+    await health.get_readiness_probe().stop()
+    if MEMO_CACHE_BROADCAST:
+        get_invalidation_listener().stop()
+    if MEMO_EVENTS_ENABLED:
+        get_memo_event_listener().stop()
+    if MEMO_PURGE_ENABLED:
+        memo_purger.stop()
+    if aws_secrets_enabled():
+        get_secret_provider().stop()
 
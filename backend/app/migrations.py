@@ -0,0 +1,285 @@
+"""Versioned schema migrations."""
+import sys
+import time
+from typing import Callable, List, NamedTuple, Optional
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import OperationalError
+
+VERSION_TABLE = "schema_version"
+# pg_advisory_lock key serializing migration runs across tasks
+MIGRATION_LOCK_KEY = 7263501
+# Seconds to wait for another process's migration run before giving up
+MIGRATION_LOCK_WAIT = 600.0
+# Seconds between attempts to take the migration lock
+MIGRATION_LOCK_POLL = 1.0
+# How long a transactional DDL step may queue for a table lock; a queued
+# ACCESS EXCLUSIVE request blocks every later reader and writer of the table.
+# Concurrent index builds are exempt: they only take SHARE UPDATE EXCLUSIVE,
+# and must be free to wait out long transactions such as an export
+DDL_LOCK_TIMEOUT = "5s"
+# Attempts per step when its DDL times out waiting for a lock, e.g. behind a
+# long export transaction; the n-th retry waits n times DDL_RETRY_DELAY
+DDL_LOCK_ATTEMPTS = 5
+DDL_RETRY_DELAY = 2.0
+# SQLSTATE lock_not_available, raised when lock_timeout expires
+LOCK_NOT_AVAILABLE = "55P03"
+
+
+class SchemaVersionError(RuntimeError):
+    """Raised when the database schema is older than the application expects."""
+
+
+class MigrationLockError(RuntimeError):
+    """Raised when another process holds the migration lock for too long."""
+
+
+class Migration(NamedTuple):
+    """One schema change; non-transactional steps may use CONCURRENTLY."""
+
+    version: int
+    description: str
+    apply: Callable[[Connection], None]
+    transactional: bool = True
+
+
+def _execute(*statements: str) -> Callable[[Connection], None]:
+    def apply(conn: Connection):
+        for statement in statements:
+            conn.execute(text(statement))
+    return apply
+
+
+def _create_index_concurrently(name: str, definition: str) -> Callable[[Connection], None]:
+    """Build an index without blocking writes to the table."""
+    def apply(conn: Connection):
+        valid = conn.execute(
+            text(
+                "SELECT i.indisvalid FROM pg_index i "
+                "JOIN pg_class c ON c.oid = i.indexrelid WHERE c.relname = :name"
+            ),
+            {"name": name}
+        ).scalar()
+        if valid is False:
+            # An interrupted concurrent build leaves an invalid index behind
+            conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+        conn.execute(text(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} {definition}"))
+    return apply
+
+
+# Append only; never edit a migration that has been deployed. Statements use
+# IF NOT EXISTS so databases created by the old create_all startup adopt them.
+MIGRATIONS: List[Migration] = [
+    Migration(
+        1,
+        "create memos table",
+        _execute(
+            """
+            CREATE TABLE IF NOT EXISTS memos (
+                id SERIAL PRIMARY KEY,
+                title VARCHAR(255) NOT NULL,
+                content TEXT,
+                created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT now(),
+                updated_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT now()
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS ix_memos_id ON memos (id)",
+        ),
+    ),
+    Migration(
+        2,
+        "index memos by (created_at, id) for keyset pagination",
+        _create_index_concurrently("ix_memos_created_at_id", "ON memos (created_at, id)"),
+        transactional=False,
+    ),
+    Migration(
+        3,
+        "full-text search index over title and content",
+        _create_index_concurrently(
+            "ix_memos_search",
+            "ON memos USING gin (to_tsvector('simple', "
+            "coalesce(title, '') || ' ' || coalesce(content, '')))",
+        ),
+        transactional=False,
+    ),
+    Migration(
+        4,
+        "sequence for memo change event ids",
+        _execute("CREATE SEQUENCE IF NOT EXISTS memo_event_id_seq"),
+    ),
+    Migration(
+        5,
+        "deleted_at column for soft deletes",
+        # Nullable without a default, so no table rewrite; still needs a brief
+        # ACCESS EXCLUSIVE lock, bounded by DDL_LOCK_TIMEOUT and retried
+        _execute("ALTER TABLE memos ADD COLUMN IF NOT EXISTS deleted_at TIMESTAMP WITHOUT TIME ZONE"),
+    ),
+    Migration(
+        6,
+        "partial keyset pagination index over live memos",
+        _create_index_concurrently(
+            "ix_memos_live_created_at_id", "ON memos (created_at, id) WHERE deleted_at IS NULL"
+        ),
+        transactional=False,
+    ),
+    Migration(
+        7,
+        "partial full-text search index over live memos",
+        _create_index_concurrently(
+            "ix_memos_live_search",
+            "ON memos USING gin (to_tsvector('simple', "
+            "coalesce(title, '') || ' ' || coalesce(content, ''))) WHERE deleted_at IS NULL",
+        ),
+        transactional=False,
+    ),
+    Migration(
+        8,
+        "index soft-deleted memos for the purge",
+        _create_index_concurrently(
+            "ix_memos_deleted_at", "ON memos (deleted_at) WHERE deleted_at IS NOT NULL"
+        ),
+        transactional=False,
+    ),
+    # ix_memos_created_at_id and ix_memos_search serve tasks still running
+    # unfiltered queries during a rolling deploy; drop them in a later
+    # release, once no task predating soft deletes is serving
+]
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+def current_version(engine: Engine) -> int:
+    """
+    Return the applied schema version; two cheap queries.
+
+    Returns:
+        The highest applied version, or 0 for an unmigrated database
+    """
+    with engine.connect() as conn:
+        if conn.execute(text("SELECT to_regclass(:name)"), {"name": VERSION_TABLE}).scalar() is None:
+            return 0
+        return conn.execute(text(f"SELECT coalesce(max(version), 0) FROM {VERSION_TABLE}")).scalar()
+
+
+def _acquire_migration_lock(conn: Connection, wait: float):
+    """
+    Take the migration advisory lock, polling with pg_try_advisory_lock.
+
+    A waiter blocked in pg_advisory_lock keeps a snapshot open, and
+    CREATE INDEX CONCURRENTLY in the lock holder waits for every open
+    snapshot, so the two would deadlock. Polling from an idle autocommit
+    connection holds none.
+    """
+    deadline = time.monotonic() + wait
+    while not conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": MIGRATION_LOCK_KEY}).scalar():
+        if time.monotonic() >= deadline:
+            raise MigrationLockError(f"Another process has held the migration lock for over {wait:.0f}s")
+        time.sleep(MIGRATION_LOCK_POLL)
+
+
+def _apply(engine: Engine, conn: Connection, migration: Migration):
+    record = text(f"INSERT INTO {VERSION_TABLE} (version, description) VALUES (:v, :d)")
+    params = {"v": migration.version, "d": migration.description}
+    if migration.transactional:
+        with engine.begin() as tx:
+            tx.execute(text(f"SET LOCAL lock_timeout = '{DDL_LOCK_TIMEOUT}'"))
+            migration.apply(tx)
+            tx.execute(record, params)
+    else:
+        migration.apply(conn)
+        conn.execute(record, params)
+
+
+def _apply_with_retry(engine: Engine, conn: Connection, migration: Migration):
+    """
+    Apply one migration, retrying when its DDL gives up waiting for a lock.
+
+    Only transactional steps run with ``lock_timeout``, and a failed
+    attempt rolls back, so rerunning it is safe.
+    """
+    for attempt in range(1, DDL_LOCK_ATTEMPTS + 1):
+        try:
+            _apply(engine, conn, migration)
+            return
+        except OperationalError as e:
+            if getattr(e.orig, "pgcode", None) != LOCK_NOT_AVAILABLE or attempt == DDL_LOCK_ATTEMPTS:
+                raise
+            print(
+                f"⚠️  Migration {migration.version} timed out waiting for a lock, "
+                f"retrying ({attempt}/{DDL_LOCK_ATTEMPTS - 1})"
+            )
+            time.sleep(DDL_RETRY_DELAY * attempt)
+
+
+def migrate(engine: Engine, target: Optional[int] = None, lock_wait: float = MIGRATION_LOCK_WAIT) -> List[int]:
+    """
+    Apply pending migrations up to ``target`` (default: latest).
+
+    Runs under an advisory lock, so concurrent runs apply each migration
+    once. Transactional steps run with ``lock_timeout`` set to
+    DDL_LOCK_TIMEOUT and are retried if that expires; concurrent index
+    builds wait as long as older transactions stay open.
+
+    Returns:
+        The versions applied by this call
+
+    Raises:
+        MigrationLockError: If the lock is not free within ``lock_wait`` seconds
+    """
+    target = LATEST_VERSION if target is None else target
+    applied = []
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        _acquire_migration_lock(conn, lock_wait)
+        try:
+            conn.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {VERSION_TABLE} ("
+                "version INTEGER PRIMARY KEY, description TEXT NOT NULL, "
+                "applied_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT now())"
+            ))
+            current = current_version(engine)
+            for migration in MIGRATIONS:
+                if not current < migration.version <= target:
+                    continue
+                _apply_with_retry(engine, conn, migration)
+                applied.append(migration.version)
+                print(f"✅ Applied migration {migration.version}: {migration.description}")
+        finally:
+            conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATION_LOCK_KEY})
+    return applied
+
+
+def ensure_schema(engine: Engine, apply_pending: bool = True, version: Optional[int] = None) -> int:
+    """
+    Verify the schema is current, applying pending migrations if allowed.
+
+    Args:
+        engine: Engine for the application database
+        apply_pending: Apply pending migrations instead of failing
+        version: Schema version already read by the caller, if any
+
+    Returns:
+        The schema version after the call
+
+    Raises:
+        SchemaVersionError: If the schema is behind and ``apply_pending`` is False
+    """
+    if version is None:
+        version = current_version(engine)
+    if version >= LATEST_VERSION:
+        return version
+    if not apply_pending:
+        raise SchemaVersionError(
+            f"Database schema is at version {version}, expected {LATEST_VERSION}. "
+            f"Run 'python init_db.py' to apply migrations."
+        )
+    migrate(engine)
+    return current_version(engine)
+
+
+if __name__ == "__main__":
+    from app.database import get_engine
+
+    command = sys.argv[1] if len(sys.argv) > 1 else "current"
+    if command == "upgrade":
+        migrate(get_engine(), int(sys.argv[2]) if len(sys.argv) > 2 else None)
+    print(f"Schema version: {current_version(get_engine())} (latest: {LATEST_VERSION})")
@@ -1,15 +1,75 @@
 """Database models."""
-from sqlalchemy import Column, Integer, String, Text, DateTime, func
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index, Sequence, func, literal_column, text
+from sqlalchemy.orm import deferred
 from app.database import Base
 
+# Text search configuration; "simple" only lowercases and splits on whitespace,
+# which works for Korean as well as English memos
+SEARCH_CONFIG = "simple"
+
+# Ids for memo change events; shared by all tasks so stream clients can resume anywhere
+EVENT_SEQUENCE = "memo_event_id_seq"
+memo_event_id_seq = Sequence(EVENT_SEQUENCE, metadata=Base.metadata)
+
 
 class Memo(Base):
     """Memo model."""
     __tablename__ = "memos"
+    # Deployed databases get these through app.migrations; keep both in sync
+    __table_args__ = (
+        # Backs keyset pagination ordered by (created_at DESC, id DESC).
+        # Partial indexes cover live memos only; queries must filter on
+        # deleted_at IS NULL for the planner to use them
+        Index(
+            "ix_memos_live_created_at_id", "created_at", "id",
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        # Full-text search over title and content; must stay in sync with
+        # memo_search_document so the planner can match the expression
+        Index(
+            "ix_memos_live_search",
+            text(
+                f"to_tsvector('{SEARCH_CONFIG}', "
+                "coalesce(title, '') || ' ' || coalesce(content, ''))"
+            ),
+            postgresql_using="gin",
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        # Lets the purge find soft-deleted memos without scanning live ones
+        Index("ix_memos_deleted_at", "deleted_at", postgresql_where=text("deleted_at IS NOT NULL")),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False)
-    content = Column(Text, nullable=True)
+    # Can be large; list queries read only a preview, see memo_summary_columns
+    content = deferred(Column(Text, nullable=True))
     created_at = Column(DateTime, server_default=func.now(), nullable=False)
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
+    # Set by DELETE requests; app.purge hard-deletes the row later
+    deleted_at = Column(DateTime, nullable=True)
+
+
+# Searchable document for a memo, matching the ix_memos_live_search expression
+memo_search_document = func.to_tsvector(
+    literal_column(f"'{SEARCH_CONFIG}'"),
+    func.coalesce(Memo.title, "") + " " + func.coalesce(Memo.content, ""),
+)
+
+
+def memo_summary_columns(preview_length: int):
+    """
+    Columns for a memo list item.
 
+    Only the first ``preview_length`` characters of content are read;
+    ``octet_length`` comes from the stored size, without detoasting the body.
+    """
+    preview = func.left(Memo.content, preview_length)
+    truncated = func.coalesce(func.octet_length(Memo.content), 0) > func.coalesce(func.octet_length(preview), 0)
+    return (
+        Memo.id,
+        Memo.title,
+        preview.label("preview"),
+        truncated.label("truncated"),
+        Memo.created_at,
+        Memo.updated_at,
+    )
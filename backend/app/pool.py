@@ -0,0 +1,84 @@
+"""Connection pool instrumentation."""
+import threading
+import time
+from typing import Any, Dict
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+
+class PoolStats:
+    """Thread-safe counters for connection checkouts."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record_wait(self, seconds: float, timed_out: bool = False):
+        """Record how long one checkout waited for a connection."""
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records checkout wait time and timeouts."""
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except PoolTimeoutError:
+            self.stats.record_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        self.stats.record_wait(time.perf_counter() - start)
+        return conn
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+
+def get_pool_status(pool: QueuePool) -> Dict[str, Any]:
+    """
+    Snapshot live statistics of a connection pool.
+
+    Args:
+        pool: Engine connection pool
+
+    Returns:
+        Dictionary matching the ``PoolStatusResponse`` schema
+    """
+    status = {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": pool._max_overflow,
+        "checkouts": 0,
+        "timeouts": 0,
+        "wait_time_avg_ms": 0.0,
+        "wait_time_max_ms": 0.0,
+    }
+    stats = getattr(pool, "stats", None)
+    if stats is not None:
+        with stats._lock:
+            attempts = stats.checkouts + stats.timeouts
+            status.update(
+                checkouts=stats.checkouts,
+                timeouts=stats.timeouts,
+                wait_time_avg_ms=round(stats.wait_total / attempts * 1000, 3) if attempts else 0.0,
+                wait_time_max_ms=round(stats.wait_max * 1000, 3),
+            )
+    return status
@@ -0,0 +1,136 @@
+"""Per-request SQL accounting, slow-query log and SQL profiling mode."""
+import contextvars
+import logging
+import time
+import weakref
+from typing import Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.metrics import DB_QUERY_LATENCY, REQUEST_DB_QUERIES, REQUEST_DB_TIME, route_label
+
+logger = logging.getLogger("app.sql")
+
+PROFILE_REQUEST_HEADER = "x-sql-profile"
+MAX_LOGGED_STATEMENT = 1000
+
+
+class RequestDBStats:
+    """SQL statement count and time accumulated for one request."""
+
+    __slots__ = ("queries", "seconds", "scope", "profile")
+
+    def __init__(self, scope: Optional[Scope] = None, profile: bool = False):
+        self.queries = 0
+        self.seconds = 0.0
+        self.scope = scope
+        self.profile = profile
+
+    def describe_route(self) -> str:
+        if self.scope is None:
+            return "-"
+        return f"{self.scope['method']} {route_label(self.scope)}"
+
+
+# Set by SQLProfilingMiddleware; run_db copies it into database worker threads
+current_db_stats: contextvars.ContextVar[Optional[RequestDBStats]] = contextvars.ContextVar(
+    "current_db_stats", default=None
+)
+
+
+_instrumented_engines: "weakref.WeakSet[Engine]" = weakref.WeakSet()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _record_statement(conn, statement: str, slow_query_threshold_ms: float):
+    elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+    DB_QUERY_LATENCY.observe(value=elapsed)
+    stats = current_db_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.seconds += elapsed
+
+    elapsed_ms = elapsed * 1000
+    profile = stats is not None and stats.profile
+    slow = 0 < slow_query_threshold_ms <= elapsed_ms
+    if slow or profile:
+        # Parameters are left out; they may carry memo content
+        logger.warning(
+            "%s %.1fms [%s] %s",
+            "Slow query" if slow else "SQL profile",
+            elapsed_ms,
+            stats.describe_route() if stats is not None else "-",
+            " ".join(statement.split())[:MAX_LOGGED_STATEMENT],
+        )
+
+
+def instrument_engine(engine: Engine, slow_query_threshold_ms: float = 0.0):
+    """
+    Time every statement executed through ``engine``.
+
+    Args:
+        engine: Engine to instrument; repeated calls are ignored
+        slow_query_threshold_ms: Log statements at least this slow; 0 disables
+    """
+    if engine in _instrumented_engines:
+        return
+    _instrumented_engines.add(engine)
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        _record_statement(conn, statement, slow_query_threshold_ms)
+
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", after_cursor_execute)
+
+
+class SQLProfilingMiddleware:
+    """
+    Tracks SQL statements issued while serving each request.
+
+    Totals feed the per-route DB metrics. For profiled requests the totals
+    are also returned in a ``Server-Timing`` header, e.g.
+    ``db;dur=12.5;desc="3 queries"``.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        profile_all: bool = False,
+        allow_header: bool = False,
+    ):
+        self.app = app
+        self.profile_all = profile_all
+        self.allow_header = allow_header
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = self.profile_all or (
+            self.allow_header
+            and Headers(scope=scope).get(PROFILE_REQUEST_HEADER, "").lower() in ("1", "true")
+        )
+        stats = RequestDBStats(scope, profile)
+
+        async def send_wrapper(message: Message):
+            if profile and message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Server-Timing",
+                    f'db;dur={stats.seconds * 1000:.2f};desc="{stats.queries} queries"',
+                )
+            await send(message)
+
+        token = current_db_stats.set(stats)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_db_stats.reset(token)
+            route = route_label(scope)
+            REQUEST_DB_TIME.observe(scope["method"], route, value=stats.seconds)
+            REQUEST_DB_QUERIES.observe(scope["method"], route, value=stats.queries)
@@ -0,0 +1,145 @@
+"""Background purge of soft-deleted memos."""
+import os
+import threading
+import time
+from datetime import timedelta
+from typing import Callable, List, Optional
+from sqlalchemy import delete, func, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+from app.config import load_phase_config
+from app.database import get_engine
+from app.metrics import Counter, Gauge, registry
+from app.models import Memo
+
+load_phase_config()
+
+# Hard-delete soft-deleted memos in the background
+MEMO_PURGE_ENABLED = os.getenv("MEMO_PURGE_ENABLED", "true").lower() == "true"
+# Seconds between purge runs while there is nothing left to purge
+MEMO_PURGE_INTERVAL = float(os.getenv("MEMO_PURGE_INTERVAL", "30"))
+# Rows hard-deleted per transaction; keeps lock time and WAL bursts bounded
+MEMO_PURGE_BATCH_SIZE = int(os.getenv("MEMO_PURGE_BATCH_SIZE", "1000"))
+# Seconds a memo stays soft-deleted before it may be purged
+MEMO_PURGE_DELAY = float(os.getenv("MEMO_PURGE_DELAY", "60"))
+# Pause between consecutive full batches so purging yields to live traffic
+BATCH_PAUSE = 0.1
+
+
+class MemoPurger:
+    """
+    Hard-deletes soft-deleted memos in bounded batches on a daemon thread.
+
+    Batches lock their rows with SKIP LOCKED, so every task can run a
+    purger without them blocking each other.
+    """
+
+    def __init__(
+        self,
+        engine_factory: Callable[[], Engine],
+        interval: float = MEMO_PURGE_INTERVAL,
+        batch_size: int = MEMO_PURGE_BATCH_SIZE,
+        delay: float = MEMO_PURGE_DELAY,
+    ):
+        self.engine_factory = engine_factory
+        self.interval = interval
+        self.batch_size = batch_size
+        self.delay = delay
+        self.purged = 0
+        self.batches = 0
+        self.pending = 0
+        self.lag_seconds = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start purging in a daemon thread."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="memo-purge", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop purging and wait for the current batch to finish."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=30)
+            self._thread = None
+
+    def purge_batch(self) -> int:
+        """
+        Hard-delete up to ``batch_size`` memos soft-deleted over ``delay`` seconds ago.
+
+        Returns:
+            Number of memos purged
+        """
+        batch = (
+            select(Memo.id)
+            .where(
+                Memo.deleted_at.is_not(None),
+                Memo.deleted_at <= func.now() - timedelta(seconds=self.delay),
+            )
+            .order_by(Memo.deleted_at)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        with self.engine_factory().begin() as conn:
+            purged = conn.execute(delete(Memo).where(Memo.id.in_(batch))).rowcount
+        self.purged += purged
+        self.batches += 1
+        return purged
+
+    def measure_backlog(self):
+        """Refresh ``pending`` and ``lag_seconds``, the age of the oldest soft-deleted memo."""
+        with self.engine_factory().connect() as conn:
+            pending, oldest_age = conn.execute(
+                select(
+                    func.count(),
+                    func.extract("epoch", func.now() - func.min(Memo.deleted_at)),
+                ).where(Memo.deleted_at.is_not(None))
+            ).one()
+        self.pending = pending
+        self.lag_seconds = float(oldest_age or 0)
+
+    def run_once(self) -> int:
+        """Purge batches until none is full, then refresh the backlog figures."""
+        purged = 0
+        while not self._stop.is_set():
+            count = self.purge_batch()
+            purged += count
+            if count < self.batch_size:
+                break
+            self._stop.wait(BATCH_PAUSE)
+        self.measure_backlog()
+        return purged
+
+    def _run(self):
+        while not self._stop.is_set():
+            started = time.perf_counter()
+            try:
+                purged = self.run_once()
+                if purged:
+                    print(f"🧹 Purged {purged} deleted memos in {time.perf_counter() - started:.2f}s")
+            except SQLAlchemyError as e:
+                print(f"⚠️  Memo purge failed: {e}")
+            self._stop.wait(self.interval)
+
+
+memo_purger = MemoPurger(get_engine)
+
+
+def _collect_purge_metrics() -> List:
+    """Expose purge progress and backlog as metrics."""
+    purged = Counter("memo_purged_total", "Soft-deleted memos hard-deleted by the purge")
+    purged.inc(amount=memo_purger.purged)
+    purge_batches = Counter("memo_purge_batches_total", "Purge batches run")
+    purge_batches.inc(amount=memo_purger.batches)
+    purge_pending = Gauge("memo_purge_pending", "Soft-deleted memos awaiting purge at the last run")
+    purge_pending.set(value=memo_purger.pending)
+    purge_lag = Gauge("memo_purge_lag_seconds", "Age of the oldest soft-deleted memo at the last run")
+    purge_lag.set(value=memo_purger.lag_seconds)
+    return [purged, purge_batches, purge_pending, purge_lag]
+
+
+registry.register_collector(_collect_purge_metrics)
@@ -0,0 +1,136 @@
+"""Background-refreshed readiness probe."""
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+import psycopg2
+from sqlalchemy.pool import QueuePool
+from app.config import load_phase_config
+from app.pool import get_pool_status
+
+load_phase_config()
+
+READINESS_INTERVAL = float(os.getenv("READINESS_INTERVAL", "5"))
+READINESS_TIMEOUT = int(os.getenv("READINESS_TIMEOUT", "2"))
+# Fraction of pool capacity in use above which the task reports not ready
+READINESS_MAX_POOL_SATURATION = float(os.getenv("READINESS_MAX_POOL_SATURATION", "0.95"))
+
+
+class ReadinessProbe:
+    """
+    Periodically checks the database and connection pool.
+
+    The check runs on its own connection and thread, so it never waits for
+    a pooled connection or a database worker thread behind real requests.
+    The readiness endpoint only reads the last result.
+    """
+
+    def __init__(
+        self,
+        dsn: str,
+        pool: QueuePool,
+        interval: float = READINESS_INTERVAL,
+        timeout: int = READINESS_TIMEOUT,
+        max_pool_saturation: float = READINESS_MAX_POOL_SATURATION,
+    ):
+        self.dsn = dsn
+        self.pool = pool
+        self.interval = interval
+        self.timeout = timeout
+        self.max_pool_saturation = max_pool_saturation
+        self._conn = None
+        self._conn_dsn: Optional[str] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="readiness")
+        self._task: Optional[asyncio.Task] = None
+        self._result: Dict[str, Any] = {
+            "status": "starting",
+            "database": False,
+            "pool_saturation": 0.0,
+            "checked_at": None,
+            "detail": "Readiness has not been checked yet",
+        }
+        self._checked_monotonic: Optional[float] = None
+
+    def retarget(self, dsn: str, pool: QueuePool):
+        """Check a new database URL and pool, e.g. after credentials rotate."""
+        self.dsn = dsn
+        self.pool = pool
+
+    def _ping_database(self):
+        if self._conn is not None and self._conn_dsn != self.dsn:
+            self._conn.close()
+        if self._conn is None or self._conn.closed:
+            self._conn_dsn = self.dsn
+            self._conn = psycopg2.connect(
+                self.dsn,
+                connect_timeout=self.timeout,
+                options=f"-c statement_timeout={self.timeout * 1000}",
+            )
+            self._conn.autocommit = True
+        try:
+            with self._conn.cursor() as cur:
+                cur.execute("SELECT 1")
+        except psycopg2.Error:
+            self._conn.close()
+            raise
+
+    def refresh(self) -> Dict[str, Any]:
+        """Run the checks now and store the result; blocking."""
+        database, detail = True, None
+        try:
+            self._ping_database()
+        except psycopg2.Error as e:
+            database, detail = False, f"Database unreachable: {str(e).strip()}"
+
+        status = get_pool_status(self.pool)
+        capacity = status["size"] + status["max_overflow"]
+        saturation = round(status["checked_out"] / capacity, 3) if capacity else 0.0
+        if database and saturation >= self.max_pool_saturation:
+            detail = f"Connection pool saturated ({status['checked_out']}/{capacity})"
+
+        self._result = {
+            "status": "ready" if detail is None else "not_ready",
+            "database": database,
+            "pool_saturation": saturation,
+            "checked_at": datetime.now(timezone.utc),
+            "detail": detail,
+        }
+        self._checked_monotonic = time.monotonic()
+        return self._result
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the last result; O(1), never touches the database."""
+        result = dict(self._result)
+        checked = self._checked_monotonic
+        if checked is not None and time.monotonic() - checked > self.interval * 3:
+            result.update(status="not_ready", detail="Readiness check is stale")
+        return result
+
+    async def _loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                await loop.run_in_executor(self._executor, self.refresh)
+            except Exception as e:
+                print(f"⚠️  Readiness check failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        """Start refreshing in the background on the running event loop."""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._loop())
+
+    async def stop(self):
+        """Stop refreshing and close the probe connection."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
@@ -0,0 +1,317 @@
+"""Redis-protocol cache backend shared by all application tasks."""
+import asyncio
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, TypeVar
+from urllib.parse import urlparse
+from app.cache import CacheBackend
+
+T = TypeVar("T")
+
+# Stores an entry only if no invalidation happened since the caller read the
+# generation; KEYS are the generation, entry and tag keys, ARGV the expected
+# generation ("" to skip the check), value and TTL in milliseconds
+SET_IF_GENERATION = """
+local generation = redis.call('GET', KEYS[1]) or '0'
+if ARGV[1] ~= '' and generation ~= ARGV[1] then
+  return 0
+end
+redis.call('SET', KEYS[2], ARGV[2], 'PX', ARGV[3])
+for i = 3, #KEYS do
+  redis.call('SADD', KEYS[i], KEYS[2])
+  redis.call('PEXPIRE', KEYS[i], ARGV[3])
+end
+return 1
+"""
+
+
+class RespError(Exception):
+    """Error reply returned by the cache server."""
+
+
+class RespClient:
+    """
+    Minimal blocking client for the Redis serialization protocol (RESP2).
+
+    Keeps up to ``max_connections`` idle connections so concurrent callers
+    do not queue behind one socket. After a connection failure the server
+    is skipped for a backoff window, doubling up to ``max_backoff``, so an
+    unreachable server costs nothing instead of a timeout per call.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        timeout: float = 0.5,
+        max_connections: int = 8,
+        backoff: float = 1.0,
+        max_backoff: float = 30.0,
+    ):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = parsed.password
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._idle: List[Tuple[socket.socket, Any]] = []
+        self._failures = 0
+        self._retry_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def available(self) -> bool:
+        """False while the server is skipped after a connection failure."""
+        return time.monotonic() >= self._retry_at
+
+    def execute(self, *args: Any) -> Any:
+        """Send one command and return its reply."""
+        return self.pipeline([args])[0]
+
+    def pipeline(self, commands: Sequence[Sequence[Any]]) -> List[Any]:
+        """
+        Send several commands in one write and read all replies.
+
+        Error replies are returned in place as :class:`RespError` instances.
+
+        Raises:
+            OSError: If the server cannot be reached or is being skipped
+        """
+        with self._lock:
+            if time.monotonic() < self._retry_at:
+                raise ConnectionError("Cache server unavailable, skipping until it recovers")
+            conn = self._idle.pop() if self._idle else None
+        try:
+            if conn is None:
+                conn = self._connect()
+            sock, file = conn
+            sock.sendall(b"".join(self._encode(cmd) for cmd in commands))
+            replies = [self._read_reply(file) for _ in commands]
+        except OSError:
+            self._close(conn)
+            with self._lock:
+                self._failures += 1
+                delay = min(self.backoff * 2 ** (self._failures - 1), self.max_backoff)
+                self._retry_at = time.monotonic() + delay
+            raise
+        except RespError:
+            self._close(conn)
+            raise
+        with self._lock:
+            self._failures = 0
+            if len(self._idle) < self.max_connections:
+                self._idle.append(conn)
+                conn = None
+        self._close(conn)
+        return replies
+
+    def close(self):
+        """Close idle connections."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            self._close(conn)
+
+    def _connect(self) -> Tuple[socket.socket, Any]:
+        sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        conn = (sock, sock.makefile("rb"))
+        setup = []
+        if self.password:
+            setup.append(("AUTH", self.password))
+        if self.db:
+            setup.append(("SELECT", self.db))
+        if setup:
+            sock.sendall(b"".join(self._encode(cmd) for cmd in setup))
+            for _ in setup:
+                reply = self._read_reply(conn[1])
+                if isinstance(reply, RespError):
+                    self._close(conn)
+                    raise reply
+        return conn
+
+    @staticmethod
+    def _close(conn: Optional[Tuple[socket.socket, Any]]):
+        if conn is None:
+            return
+        try:
+            conn[0].close()
+        except OSError:
+            pass
+
+    @staticmethod
+    def _encode(args: Sequence[Any]) -> bytes:
+        parts = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            if isinstance(arg, bytes):
+                data = arg
+            else:
+                data = str(arg).encode("utf-8")
+            parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        return b"".join(parts)
+
+    def _read_reply(self, file) -> Any:
+        line = file.readline()
+        if not line.endswith(b"\r\n"):
+            raise ConnectionError("Connection closed by cache server")
+        kind, payload = line[:1], line[1:-2]
+        if kind == b"+":
+            return payload.decode("utf-8")
+        if kind == b"-":
+            return RespError(payload.decode("utf-8"))
+        if kind == b":":
+            return int(payload)
+        if kind == b"$":
+            length = int(payload)
+            if length < 0:
+                return None
+            data = file.read(length + 2)
+            return data[:-2]
+        if kind == b"*":
+            length = int(payload)
+            if length < 0:
+                return None
+            return [self._read_reply(file) for _ in range(length)]
+        raise RespError(f"Unexpected reply type {kind!r}")
+
+
+class RedisCache(CacheBackend):
+    """
+    Cache backend stored on a Redis-protocol server.
+
+    Every task shares the same entries, so a write on one task invalidates
+    them for all. Server errors degrade to cache misses rather than failing
+    the request. Async callers run operations on a small dedicated thread
+    pool so socket I/O never blocks the event loop.
+    """
+
+    name = "redis"
+    shared = True
+
+    def __init__(
+        self,
+        url: str,
+        ttl: float,
+        prefix: str = "memo-cache",
+        timeout: float = 0.5,
+        max_connections: int = 8,
+    ):
+        self.client = RespClient(url, timeout=timeout, max_connections=max_connections)
+        self._executor = ThreadPoolExecutor(max_workers=max_connections, thread_name_prefix="memo-cache")
+        self.ttl = ttl
+        self.prefix = prefix
+        self._generation_key = f"{prefix}:generation"
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.errors = 0
+
+    def _entry_key(self, key: str) -> str:
+        return f"{self.prefix}:entry:{key}"
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.prefix}:tag:{tag}"
+
+    def _count(self, counter: str, amount: int = 1):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + amount)
+
+    def _on_error(self, e: Exception):
+        self._count("errors")
+        if self.errors == 1:
+            print(f"⚠️  Cache server error, serving without cache: {e}")
+
+    async def _run(self, func: Callable[..., T], *args: Any) -> T:
+        if not self.client.available:
+            # Skipped server: the call fails fast without touching the network
+            return func(*args)
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    def generation(self) -> int:
+        try:
+            return int(self.client.execute("GET", self._generation_key) or 0)
+        except (OSError, RespError, ValueError) as e:
+            self._on_error(e)
+            return -1
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            value = self.client.execute("GET", self._entry_key(key))
+        except (OSError, RespError) as e:
+            self._on_error(e)
+            value = None
+        self._count("hits" if value is not None else "misses")
+        return value
+
+    def set(
+        self,
+        key: str,
+        value: bytes,
+        tags: Iterable[str] = (),
+        generation: Optional[int] = None,
+        ttl: Optional[float] = None,
+    ):
+        ttl_ms = int((self.ttl if ttl is None else min(ttl, self.ttl)) * 1000)
+        if ttl_ms <= 0:
+            return
+        keys = [self._generation_key, self._entry_key(key)] + [self._tag_key(tag) for tag in tags]
+        expected = "" if generation is None else generation
+        try:
+            reply = self.client.execute(
+                "EVAL", SET_IF_GENERATION, len(keys), *keys, expected, value, ttl_ms
+            )
+        except (OSError, RespError) as e:
+            self._on_error(e)
+            return
+        if isinstance(reply, RespError):
+            self._on_error(reply)
+
+    def invalidate_tags(self, tags: Iterable[str]):
+        tag_keys = [self._tag_key(tag) for tag in tags]
+        try:
+            replies = self.client.pipeline(
+                [("INCR", self._generation_key)] + [("SMEMBERS", k) for k in tag_keys]
+            )
+            entry_keys = {key for members in replies[1:] if isinstance(members, list) for key in members}
+            if tag_keys or entry_keys:
+                self.client.execute("DEL", *tag_keys, *entry_keys)
+        except (OSError, RespError) as e:
+            self._on_error(e)
+            return
+        self._count("invalidations", len(entry_keys))
+
+    def clear(self):
+        try:
+            self.client.execute("INCR", self._generation_key)
+            cursor = "0"
+            while True:
+                cursor, keys = self.client.execute(
+                    "SCAN", cursor, "MATCH", f"{self.prefix}:*", "COUNT", 1000
+                )
+                keys = [k for k in keys if k != self._generation_key.encode("utf-8")]
+                if keys:
+                    self.client.execute("DEL", *keys)
+                cursor = cursor.decode("utf-8") if isinstance(cursor, bytes) else str(cursor)
+                if cursor == "0":
+                    break
+        except (OSError, RespError) as e:
+            self._on_error(e)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "backend": self.name,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": None,
+                "invalidations": self.invalidations,
+                "entries": None,
+                "max_entries": None,
+                "ttl_seconds": self.ttl,
+                "errors": self.errors,
+            }
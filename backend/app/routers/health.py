@@ -1,12 +1,58 @@
 """Health check router."""
+from functools import lru_cache
 from fastapi import APIRouter
-from app.schemas import HealthResponse
+from fastapi.responses import JSONResponse
+from app.cache import memo_cache
+from app.database import get_database_url, get_engine
+from app.pool import get_pool_status
+from app.readiness import ReadinessProbe
+from app.schemas import (
+    CacheStatsResponse,
+    HealthResponse,
+    PoolStatusResponse,
+    ReadinessResponse,
+)
 
 router = APIRouter(prefix="/api", tags=["health"])
 
 
+@lru_cache(maxsize=None)
+def get_readiness_probe() -> ReadinessProbe:
+    """Create the readiness probe on first use; it is started on application startup."""
+    return ReadinessProbe(get_database_url(), get_engine().pool)
+
+
 @router.get("/health", response_model=HealthResponse)
 async def health_check():
     """Health check endpoint."""
     return HealthResponse(status="ok", message="Service is healthy")
 
+
+@router.get("/health/live", response_model=HealthResponse)
+async def liveness_check():
+    """Liveness endpoint; the process is up and serving requests."""
+    return HealthResponse(status="ok", message="Service is alive")
+
+
+@router.get(
+    "/health/ready",
+    response_model=ReadinessResponse,
+    responses={503: {"model": ReadinessResponse}},
+)
+async def readiness_check():
+    """Readiness endpoint; reports the last background database and pool check."""
+    result = ReadinessResponse(**get_readiness_probe().snapshot())
+    status_code = 200 if result.status == "ready" else 503
+    return JSONResponse(status_code=status_code, content=result.model_dump(mode="json"))
+
+
+@router.get("/health/pool", response_model=PoolStatusResponse)
+async def pool_status():
+    """Database connection pool statistics."""
+    return PoolStatusResponse(**get_pool_status(get_engine().pool))
+
+
+@router.get("/health/cache", response_model=CacheStatsResponse)
+async def cache_stats():
+    """Memo read cache statistics."""
+    return CacheStatsResponse(**memo_cache.stats())
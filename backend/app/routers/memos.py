@@ -1,41 +1,480 @@
 """Memo router."""
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
-from app.database import get_db
-from app.models import Memo
-from app.schemas import MemoCreate, MemoResponse
+import hashlib
+from datetime import datetime
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import any_, bindparam, cast, func, insert, literal_column, select, tuple_, update
+from sqlalchemy import Integer, REAL
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Session, undefer
+from pydantic import BaseModel
+from typing import AsyncIterator, Iterator, List, Optional, Tuple
+from app.batching import MEMO_WRITE_BATCHING, WriteBatcher
+from app.cache import MEMO_CACHE_REPLICA_TTL, memo_cache
+from app.database import SessionLocal, get_db, get_engine, get_read_db, mark_recent_write, run_db
+from app.events import MEMO_EVENTS_ENABLED, memo_events, publish_memo_event
+from app.invalidation import publish_invalidation
+from app.metrics import Counter, registry
+from app.models import SEARCH_CONFIG, Memo, memo_search_document, memo_summary_columns
+from app.pagination import InvalidCursorError, decode_cursor, encode_cursor
+from app.schemas import (
+    MEMO_PREVIEW_LENGTH,
+    MemoBulkCreate,
+    MemoBulkCreateResponse,
+    MemoBulkDelete,
+    MemoBulkDeleteResponse,
+    MemoCreate,
+    MemoDeleteResult,
+    MemoPage,
+    MemoResponse,
+    MemoSummary,
+)
 
 router = APIRouter(prefix="/api", tags=["memos"])
 
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
 
-@router.get("/memos", response_model=List[MemoResponse])
-async def get_memos(db: Session = Depends(get_db)):
-    """Get all memos."""
-    memos = db.query(Memo).order_by(Memo.created_at.desc()).all()
-    return memos
+# Rows fetched per server-side cursor round-trip when exporting
+EXPORT_CHUNK_SIZE = 1000
+
+# Cache tag carried by first pages, which every new memo lands on
+HEAD_TAG = "memos:head"
+
+
+def _json_response(model: BaseModel, status_code: int = status.HTTP_200_OK) -> Response:
+    """Serialize a schema with Pydantic's native JSON encoder, skipping jsonable_encoder."""
+    return Response(
+        content=model.model_dump_json(),
+        status_code=status_code,
+        media_type="application/json",
+    )
+
+
+def _memo_tag(memo_id: int) -> str:
+    """Cache tag for entries that contain the given memo."""
+    return f"memo:{memo_id}"
+
+
+def _compute_etag(body: bytes) -> str:
+    """Strong ETag for a response body."""
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header value against an ETag."""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or any(
+        tag.removeprefix("W/") == etag for tag in candidates
+    )
+
+
+# Cached list entries are the fixed-length ETag followed by the body, so a
+# conditional request is answered from the cache without touching the body
+_ETAG_LENGTH = 34
+
+
+def _pack_cached(etag: str, body: bytes) -> bytes:
+    return etag.encode("ascii") + body
+
+
+def _unpack_cached(value: bytes) -> Tuple[str, bytes]:
+    return value[:_ETAG_LENGTH].decode("ascii"), value[_ETAG_LENGTH:]
+
+
+def _cache_ttl(db: Session) -> Optional[float]:
+    """
+    TTL for caching a read from ``db``.
+
+    A lagging replica can return a page older than the generation taken
+    before the read, so replica reads are only kept briefly.
+    """
+    return MEMO_CACHE_REPLICA_TTL if db.info.get("replica") else None
+
+
+def _conditional_response(etag: str, body: bytes, if_none_match: Optional[str]) -> Response:
+    """JSON response revalidated by ETag; 304 with no body if the client's copy is current."""
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _parse_memo_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a memo list cursor into its (created_at, id) key."""
+    try:
+        created_at, memo_id = decode_cursor(cursor, 2)
+        return datetime.fromisoformat(created_at), int(memo_id)
+    except (InvalidCursorError, TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def _list_memos(db: Session, after: Optional[Tuple[datetime, int]], limit: int) -> MemoPage:
+    """Load one page of memos older than the ``after`` key."""
+    query = (
+        db.query(*memo_summary_columns(MEMO_PREVIEW_LENGTH))
+        .filter(Memo.deleted_at.is_(None))
+        .order_by(Memo.created_at.desc(), Memo.id.desc())
+    )
+    if after:
+        query = query.filter(tuple_(Memo.created_at, Memo.id) < after)
+
+    # Fetch one extra row to learn whether another page exists
+    memos = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(memos) > limit:
+        memos = memos[:limit]
+        last = memos[-1]
+        next_cursor = encode_cursor([last.created_at.isoformat(), last.id])
+    return MemoPage(
+        items=[MemoSummary.model_validate(memo) for memo in memos],
+        next_cursor=next_cursor,
+    )
+
+
+def _parse_search_cursor(cursor: str) -> Tuple[float, int]:
+    """Decode a search cursor into its (rank, id) key."""
+    try:
+        rank, memo_id = decode_cursor(cursor, 2)
+        return float(rank), int(memo_id)
+    except (InvalidCursorError, TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def _search_memos(
+    db: Session, q: str, after: Optional[Tuple[float, int]], limit: int
+) -> MemoPage:
+    """Load one page of memos matching ``q``, best match first."""
+    tsquery = func.websearch_to_tsquery(literal_column(f"'{SEARCH_CONFIG}'"), q)
+    # ts_rank returns real; comparing the cursor as real keeps ties exact
+    rank = func.ts_rank(memo_search_document, tsquery)
+    query = (
+        db.query(*memo_summary_columns(MEMO_PREVIEW_LENGTH), rank.label("rank"))
+        .filter(Memo.deleted_at.is_(None), memo_search_document.op("@@")(tsquery))
+        .order_by(rank.desc(), Memo.id.desc())
+    )
+    if after:
+        query = query.filter(tuple_(rank, Memo.id) < tuple_(cast(after[0], REAL), after[1]))
+
+    rows = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor([last.rank, last.id])
+    return MemoPage(
+        items=[MemoSummary.model_validate(row) for row in rows],
+        next_cursor=next_cursor,
+    )
+
+
+def _create_memo(db: Session, memo: MemoCreate) -> MemoResponse:
+    """Insert a memo with INSERT ... RETURNING, so server defaults come back in one round-trip."""
+    db_memo = db.scalars(
+        insert(Memo)
+        .values(title=memo.title, content=memo.content)
+        .returning(Memo)
+        .options(undefer(Memo.content))
+    ).one()
+    # Serialize before commit expires the returned instance
+    created = MemoResponse.model_validate(db_memo)
+    publish_invalidation(db, [HEAD_TAG])
+    publish_memo_event(db, "created", [created.id])
+    db.commit()
+    return created
+
+
+def _export_chunks(db: Session, chunk_size: int) -> Iterator[bytes]:
+    """
+    Yield every memo as NDJSON, ``chunk_size`` rows per chunk.
+
+    Rows come from a server-side cursor inside one REPEATABLE READ
+    transaction, so memory stays constant and the export is a consistent
+    snapshot.
+    """
+    db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+    result = db.execute(
+        select(Memo.id, Memo.title, Memo.content, Memo.created_at, Memo.updated_at)
+        .where(Memo.deleted_at.is_(None))
+        .order_by(Memo.id)
+        .execution_options(yield_per=chunk_size)
+    )
+    for rows in result.partitions():
+        yield b"".join(
+            MemoResponse.model_validate(row).model_dump_json().encode("utf-8") + b"\n"
+            for row in rows
+        )
+
+
+def _close_export(chunks: Iterator[bytes], db: Session):
+    chunks.close()
+    db.close()
+
+
+async def _stream_export(db: Session) -> AsyncIterator[bytes]:
+    """Advance the export on the database thread pool, one chunk at a time."""
+    chunks = _export_chunks(db, EXPORT_CHUNK_SIZE)
+    try:
+        while True:
+            chunk = await run_db(next, chunks, None)
+            if chunk is None:
+                break
+            yield chunk
+    finally:
+        # Also runs if the client disconnects mid-export
+        await run_db(_close_export, chunks, db)
+
+
+def _get_memo(db: Session, memo_id: int) -> Optional[MemoResponse]:
+    """Load one memo including its full content."""
+    memo = db.get(Memo, memo_id, options=[undefer(Memo.content)])
+    if memo is None or memo.deleted_at is not None:
+        return None
+    return MemoResponse.model_validate(memo)
+
+
+def _delete_memo(db: Session, memo_id: int) -> bool:
+    """
+    Soft-delete a memo with UPDATE ... RETURNING id, returning False if it does not exist.
+
+    The row is hard-deleted later by app.purge, off the request path.
+    """
+    deleted_id = db.scalar(
+        update(Memo)
+        .where(Memo.id == memo_id, Memo.deleted_at.is_(None))
+        .values(deleted_at=func.now())
+        .returning(Memo.id)
+        .execution_options(synchronize_session=False)
+    )
+    if deleted_id is not None:
+        publish_invalidation(db, [_memo_tag(memo_id)])
+        publish_memo_event(db, "deleted", [deleted_id])
+    db.commit()
+    return deleted_id is not None
+
+
+def _bulk_create_memos(db: Session, memos: List[MemoCreate]) -> List[MemoResponse]:
+    """Insert memos with a single multi-row INSERT ... RETURNING."""
+    rows = db.scalars(
+        insert(Memo).returning(Memo, sort_by_parameter_order=True).options(undefer(Memo.content)),
+        [{"title": memo.title, "content": memo.content} for memo in memos],
+    )
+    # Serialize before commit expires the returned instances
+    created = [MemoResponse.model_validate(row) for row in rows]
+    publish_invalidation(db, [HEAD_TAG])
+    publish_memo_event(db, "created", [memo.id for memo in created])
+    db.commit()
+    return created
+
+
+# Coalesces single creates into multi-row inserts when MEMO_WRITE_BATCHING is on
+create_batcher: WriteBatcher[MemoCreate, MemoResponse] = WriteBatcher(
+    _bulk_create_memos, _create_memo, lambda: SessionLocal(bind=get_engine())
+)
+
+
+def _collect_write_batch_metrics() -> List:
+    """Expose write batching counts as metrics."""
+    write_batches = Counter("memo_write_batches_total", "Batched memo creates written")
+    write_batches.inc(amount=create_batcher.batches)
+    write_batched = Counter("memo_write_batched_items_total", "Memos created through write batches")
+    write_batched.inc(amount=create_batcher.items)
+    write_fallbacks = Counter(
+        "memo_write_batch_fallbacks_total", "Failed write batches retried one memo at a time"
+    )
+    write_fallbacks.inc(amount=create_batcher.fallbacks)
+    return [write_batches, write_batched, write_fallbacks]
+
+
+registry.register_collector(_collect_write_batch_metrics)
+
+
+def _bulk_delete_memos(db: Session, memo_ids: List[int]) -> List[int]:
+    """Soft-delete memos with a single UPDATE ... WHERE id = ANY(...) and return deleted ids."""
+    stmt = (
+        update(Memo)
+        .where(
+            Memo.id == any_(bindparam("ids", list(set(memo_ids)), type_=ARRAY(Integer))),
+            Memo.deleted_at.is_(None),
+        )
+        .values(deleted_at=func.now())
+        .returning(Memo.id)
+        .execution_options(synchronize_session=False)
+    )
+    deleted = list(db.scalars(stmt))
+    publish_invalidation(db, [_memo_tag(memo_id) for memo_id in deleted])
+    publish_memo_event(db, "deleted", deleted)
+    db.commit()
+    return deleted
+
+
+@router.get("/memos", response_model=MemoPage)
+async def get_memos(
+    cursor: Optional[str] = Query(None, description="Cursor returned by the previous page"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Page size"),
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_read_db),
+):
+    """
+    Get a page of memos, newest first.
+
+    Responses carry an ETag; a request whose If-None-Match matches the
+    current page gets 304 Not Modified with no body.
+    """
+    after = _parse_memo_cursor(cursor) if cursor else None
+    key = f"memos:list:{limit}:{cursor or ''}"
+    # After its own write a client reads the primary; the cache may still hold
+    # a page read from a lagging replica
+    cached = None if db.info.get("read_your_writes") else await memo_cache.aget(key)
+    if cached is not None:
+        etag, body = _unpack_cached(cached)
+    else:
+        generation = await memo_cache.ageneration()
+        page = await run_db(_list_memos, db, after, limit)
+        body = page.model_dump_json().encode("utf-8")
+        etag = _compute_etag(body)
+        # Keyset pages only change when one of their own memos is deleted,
+        # or, for first pages, when a memo is created
+        tags = [_memo_tag(memo.id) for memo in page.items]
+        if after is None:
+            tags.append(HEAD_TAG)
+        await memo_cache.aset(key, _pack_cached(etag, body), tags, generation, _cache_ttl(db))
+
+    return _conditional_response(etag, body, if_none_match)
+
+
+@router.get("/memos/search", response_model=MemoPage)
+async def search_memos(
+    q: str = Query(..., min_length=1, max_length=200, description="Search terms"),
+    cursor: Optional[str] = Query(None, description="Cursor returned by the previous page"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Page size"),
+    db: Session = Depends(get_read_db),
+):
+    """Full-text search over memo titles and content, ranked by relevance."""
+    after = _parse_search_cursor(cursor) if cursor else None
+    return _json_response(await run_db(_search_memos, db, q, after, limit))
+
+
+@router.get("/memos/stream", response_class=StreamingResponse)
+async def stream_memo_events(last_event_id: Optional[str] = Header(None)):
+    """
+    Server-Sent Events stream of memo creations and deletions.
+
+    ``created`` events carry summaries of the new memos, ``deleted`` events their ids.
+    A reconnecting client sends Last-Event-ID and gets the events it missed,
+    or a ``reset`` event when it must reload the list instead.
+    """
+    if not MEMO_EVENTS_ENABLED:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Memo events are disabled"
+        )
+    return StreamingResponse(
+        memo_events.stream(last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/memos/export", response_class=StreamingResponse)
+async def export_memos(db: Session = Depends(get_read_db)):
+    """
+    Export every memo as newline-delimited JSON, oldest id first.
+
+    Streams with constant memory; import the file with scripts/import_memos.py.
+    """
+    return StreamingResponse(
+        _stream_export(db),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="memos.ndjson"'},
+    )
+
+
+# Declared after the static /memos/... routes, which it would otherwise shadow
+@router.get("/memos/{memo_id}", response_model=MemoResponse)
+async def get_memo(
+    memo_id: int,
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_read_db),
+):
+    """Get one memo with its full content; list responses only carry a preview."""
+    key = f"memos:item:{memo_id}"
+    cached = None if db.info.get("read_your_writes") else await memo_cache.aget(key)
+    if cached is not None:
+        etag, body = _unpack_cached(cached)
+    else:
+        generation = await memo_cache.ageneration()
+        memo = await run_db(_get_memo, db, memo_id)
+        if memo is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Memo with id {memo_id} not found"
+            )
+        body = memo.model_dump_json().encode("utf-8")
+        etag = _compute_etag(body)
+        await memo_cache.aset(
+            key, _pack_cached(etag, body), [_memo_tag(memo_id)], generation, _cache_ttl(db)
+        )
+    return _conditional_response(etag, body, if_none_match)
 
 
 @router.post("/memos", response_model=MemoResponse, status_code=status.HTTP_201_CREATED)
 async def create_memo(memo: MemoCreate, db: Session = Depends(get_db)):
     """Create a new memo."""
-    db_memo = Memo(title=memo.title, content=memo.content)
-    db.add(db_memo)
-    db.commit()
-    db.refresh(db_memo)
-    return db_memo
+    if MEMO_WRITE_BATCHING:
+        created = await create_batcher.submit(memo)
+    else:
+        created = await run_db(_create_memo, db, memo)
+    await memo_cache.ainvalidate_tags([HEAD_TAG])
+    response = _json_response(created, status.HTTP_201_CREATED)
+    mark_recent_write(response)
+    return response
 
 
 @router.delete("/memos/{memo_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_memo(memo_id: int, db: Session = Depends(get_db)):
+async def delete_memo(memo_id: int, response: Response, db: Session = Depends(get_db)):
     """Delete a memo."""
-    db_memo = db.query(Memo).filter(Memo.id == memo_id).first()
-    if not db_memo:
+    if not await run_db(_delete_memo, db, memo_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Memo with id {memo_id} not found"
         )
-    db.delete(db_memo)
-    db.commit()
+    await memo_cache.ainvalidate_tags([_memo_tag(memo_id)])
+    mark_recent_write(response)
     return None
 
+
+@router.post(
+    "/memos/bulk",
+    response_model=MemoBulkCreateResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def bulk_create_memos(payload: MemoBulkCreate, db: Session = Depends(get_db)):
+    """Create several memos in one statement."""
+    created = await run_db(_bulk_create_memos, db, payload.items)
+    await memo_cache.ainvalidate_tags([HEAD_TAG])
+    response = _json_response(MemoBulkCreateResponse(items=created), status.HTTP_201_CREATED)
+    mark_recent_write(response)
+    return response
+
+
+@router.post("/memos/bulk-delete", response_model=MemoBulkDeleteResponse)
+async def bulk_delete_memos(payload: MemoBulkDelete, db: Session = Depends(get_db)):
+    """Delete several memos in one statement, reporting which ids existed."""
+    deleted = set(await run_db(_bulk_delete_memos, db, payload.ids))
+    await memo_cache.ainvalidate_tags([_memo_tag(memo_id) for memo_id in deleted])
+    results = [
+        MemoDeleteResult(id=memo_id, deleted=memo_id in deleted)
+        for memo_id in dict.fromkeys(payload.ids)
+    ]
+    response = _json_response(MemoBulkDeleteResponse(results=results))
+    mark_recent_write(response)
+    return response
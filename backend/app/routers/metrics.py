@@ -0,0 +1,41 @@
+"""Prometheus metrics router."""
+from typing import List
+from fastapi import APIRouter
+from fastapi.responses import Response
+from app.cache import memo_cache
+from app.database import get_engine
+from app.metrics import CONTENT_TYPE_LATEST, Counter, Gauge, registry
+from app.pool import get_pool_status
+
+router = APIRouter(tags=["metrics"])
+
+
+def _collect_pool_and_cache() -> List:
+    """Expose connection pool and memo cache statistics as metrics."""
+    pool = get_pool_status(get_engine().pool)
+    pool_connections = Gauge("db_pool_connections", "Database pool connections by state", ("state",))
+    pool_connections.set("checked_out", value=pool["checked_out"])
+    pool_connections.set("checked_in", value=pool["checked_in"])
+    pool_connections.set("overflow", value=pool["overflow"])
+    pool_checkouts = Counter("db_pool_checkouts_total", "Successful pool checkouts")
+    pool_checkouts.inc(amount=pool["checkouts"])
+    pool_timeouts = Counter("db_pool_timeouts_total", "Pool checkouts that timed out")
+    pool_timeouts.inc(amount=pool["timeouts"])
+    pool_wait = Gauge("db_pool_wait_max_seconds", "Longest pool checkout wait since startup")
+    pool_wait.set(value=pool["wait_time_max_ms"] / 1000)
+
+    cache = memo_cache.stats()
+    cache_requests = Counter("memo_cache_requests_total", "Memo cache lookups by result", ("result",))
+    cache_requests.inc("hit", amount=cache["hits"])
+    cache_requests.inc("miss", amount=cache["misses"])
+
+    return [pool_connections, pool_checkouts, pool_timeouts, pool_wait, cache_requests]
+
+
+registry.register_collector(_collect_pool_and_cache)
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Metrics in Prometheus text exposition format."""
+    return Response(content=registry.render(), media_type=CONTENT_TYPE_LATEST)
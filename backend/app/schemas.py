@@ -1,7 +1,7 @@
 """Pydantic schemas for request/response validation."""
 from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 
 class MemoBase(BaseModel):
@@ -25,8 +25,99 @@ class MemoResponse(MemoBase):
         from_attributes = True
 
 
+MEMO_PREVIEW_LENGTH = 200
+
+
+class MemoSummary(BaseModel):
+    """Schema for a memo in list responses, with content cut to a preview."""
+    id: int
+    title: str
+    preview: Optional[str] = Field(
+        None, description=f"First {MEMO_PREVIEW_LENGTH} characters of the content"
+    )
+    truncated: bool = Field(
+        False, description="Whether the content is longer than the preview; fetch the memo for all of it"
+    )
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class MemoPage(BaseModel):
+    """Schema for a page of memos."""
+    items: List[MemoSummary]
+    next_cursor: Optional[str] = Field(
+        None, description="Cursor for the next page, or null on the last page"
+    )
+
+
+MAX_BULK_ITEMS = 1000
+
+
+class MemoBulkCreate(BaseModel):
+    """Schema for creating several memos in one request."""
+    items: List[MemoCreate] = Field(..., min_length=1, max_length=MAX_BULK_ITEMS)
+
+
+class MemoBulkCreateResponse(BaseModel):
+    """Schema for bulk create results, in request order."""
+    items: List[MemoResponse]
+
+
+class MemoBulkDelete(BaseModel):
+    """Schema for deleting several memos in one request."""
+    ids: List[int] = Field(..., min_length=1, max_length=MAX_BULK_ITEMS)
+
+
+class MemoDeleteResult(BaseModel):
+    """Outcome of deleting a single memo."""
+    id: int
+    deleted: bool
+
+
+class MemoBulkDeleteResponse(BaseModel):
+    """Schema for bulk delete results, in request order."""
+    results: List[MemoDeleteResult]
+
+
 class HealthResponse(BaseModel):
     """Health check response schema."""
     status: str = "ok"
     message: str = "Service is healthy"
 
+
+class PoolStatusResponse(BaseModel):
+    """Database connection pool statistics schema."""
+    size: int = Field(..., description="Configured number of persistent connections")
+    checked_in: int = Field(..., description="Idle connections in the pool")
+    checked_out: int = Field(..., description="Connections currently in use")
+    overflow: int = Field(..., description="Connections opened beyond the pool size")
+    max_overflow: int
+    checkouts: int = Field(..., description="Successful checkouts since startup")
+    timeouts: int = Field(..., description="Checkouts that timed out waiting for a connection")
+    wait_time_avg_ms: float
+    wait_time_max_ms: float
+
+
+class CacheStatsResponse(BaseModel):
+    """Memo read cache statistics schema."""
+    backend: str
+    hits: int
+    misses: int
+    evictions: Optional[int] = Field(None, description="Not reported by shared backends")
+    invalidations: int
+    entries: Optional[int] = Field(None, description="Not reported by shared backends")
+    max_entries: Optional[int] = None
+    ttl_seconds: float
+    errors: int = 0
+
+
+class ReadinessResponse(BaseModel):
+    """Readiness check response schema."""
+    status: str = Field(..., description="ready, not_ready or starting")
+    database: bool
+    pool_saturation: float = Field(..., description="Checked-out share of pool capacity")
+    checked_at: Optional[datetime] = None
+    detail: Optional[str] = None
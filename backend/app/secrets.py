@@ -1,21 +1,28 @@
 """AWS Secrets Manager integration for secure credential management."""
 import os
 import json
-import boto3
-from botocore.exceptions import ClientError
-from typing import Optional, Dict, Any
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from app.config import load_phase_config
 
+load_phase_config()
 
-def get_secret(secret_name: str, region_name: str = "ap-northeast-2") -> Optional[Dict[str, Any]]:
+DEFAULT_REGION = "ap-northeast-2"
+POSTGRES_SECRET_NAME = "prod/ignite-pilot/postgresInfo2"
+# Secrets are re-read at most this often on the request path, and polled in
+# the background so rotations are picked up without a restart
+SECRETS_CACHE_TTL = float(os.getenv("SECRETS_CACHE_TTL", "300"))
+SECRETS_REFRESH_INTERVAL = float(os.getenv("SECRETS_REFRESH_INTERVAL", "300"))
+
+
+def aws_secrets_enabled() -> bool:
     """
-    Retrieve secret from AWS Secrets Manager.
-    
-    Args:
-        secret_name: Name of the secret in AWS Secrets Manager
-        region_name: AWS region name (default: ap-northeast-2)
-    
+    Decide whether secrets should be read from AWS Secrets Manager.
+
     Returns:
-        Dictionary containing secret values, or None if retrieval fails
+        True when explicitly enabled, running in AWS, or in a deployed PHASE,
+        unless USE_AWS_SECRETS=false
     """
     # Use AWS Secrets Manager if explicitly enabled or if running in AWS environment
 
@@ -23,7 +30,7 @@ def get_secret(secret_name: str, region_name: str = "ap-northeast-2") -> Optiona
     use_aws_secrets_env = os.getenv("USE_AWS_SECRETS", "").lower()
     if use_aws_secrets_env == "false":
         # Explicitly disabled, skip all other checks
-        return None
+        return False
 
     # Check if explicitly enabled
     use_aws_secrets = use_aws_secrets_env == "true"
@@ -49,50 +56,225 @@ def get_secret(secret_name: str, region_name: str = "ap-northeast-2") -> Optiona
             # This allows testing with environment variables even in alpha/beta/production PHASE
             use_aws_secrets = True
 
-    # In local development without AWS env, return None to use environment variables
-    if not use_aws_secrets:
-        return None
-    
-    try:
-        session = boto3.session.Session()
-        client = session.client(
-            service_name='secretsmanager',
-            region_name=region_name
-        )
-        
-        get_secret_value_response = client.get_secret_value(SecretId=secret_name)
-        
-        # Parse the secret string (could be JSON or plain text)
-        secret_string = get_secret_value_response['SecretString']
+    return use_aws_secrets
+
+
+class SecretSource:
+    """Interface for backends that fetch a secret by name."""
+
+    def fetch(self, secret_name: str) -> Optional[Dict[str, Any]]:
+        """Return the current secret value, or None if it can't be retrieved."""
+        raise NotImplementedError
+
+
+class AWSSecretSource(SecretSource):
+    """Reads secrets from AWS Secrets Manager with one reused client."""
+
+    def __init__(self, region_name: str = DEFAULT_REGION):
+        self.region_name = region_name
+        self._client = None
+        self._lock = threading.Lock()
+
+    def _get_client(self):
+        with self._lock:
+            if self._client is None:
+                # Imported here so processes that never reach AWS don't pay for boto3
+                import boto3
+
+                session = boto3.session.Session()
+                self._client = session.client(
+                    service_name='secretsmanager',
+                    region_name=self.region_name
+                )
+            return self._client
+
+    def fetch(self, secret_name: str) -> Optional[Dict[str, Any]]:
+        from botocore.exceptions import ClientError
+
         try:
-            return json.loads(secret_string)
-        except json.JSONDecodeError:
-            # If not JSON, return as plain text
-            return {"value": secret_string}
-            
-    except ClientError as e:
-        error_code = e.response['Error']['Code']
-        error_message = e.response['Error'].get('Message', '')
-        if error_code == 'ResourceNotFoundException':
-            print(f"❌ Secret '{secret_name}' not found in AWS Secrets Manager")
-            print(f"   Please verify the secret name exists in region {region_name}")
-        elif error_code == 'InvalidRequestException':
-            print(f"❌ Invalid request for secret '{secret_name}': {error_message}")
-        elif error_code == 'InvalidParameterException':
-            print(f"❌ Invalid parameter for secret '{secret_name}': {error_message}")
-        elif error_code == 'DecryptionFailureException':
-            print(f"❌ Decryption failure for secret '{secret_name}': {error_message}")
-        elif error_code == 'AccessDeniedException':
-            print(f"❌ Access denied for secret '{secret_name}'")
-            print(f"   Current IAM role/user may not have permission to access this secret")
-        elif error_code == 'InternalServiceErrorException':
-            print(f"❌ Internal service error for secret '{secret_name}': {error_message}")
-        else:
-            print(f"❌ Error retrieving secret '{secret_name}': {error_code} - {error_message}")
-        return None
-    except Exception as e:
-        print(f"Unexpected error retrieving secret {secret_name}: {e}")
+            get_secret_value_response = self._get_client().get_secret_value(SecretId=secret_name)
+
+            # Parse the secret string (could be JSON or plain text)
+            secret_string = get_secret_value_response['SecretString']
+            try:
+                return json.loads(secret_string)
+            except json.JSONDecodeError:
+                # If not JSON, return as plain text
+                return {"value": secret_string}
+
+        except ClientError as e:
+            error_code = e.response['Error']['Code']
+            error_message = e.response['Error'].get('Message', '')
+            if error_code == 'ResourceNotFoundException':
+                print(f"❌ Secret '{secret_name}' not found in AWS Secrets Manager")
+                print(f"   Please verify the secret name exists in region {self.region_name}")
+            elif error_code == 'InvalidRequestException':
+                print(f"❌ Invalid request for secret '{secret_name}': {error_message}")
+            elif error_code == 'InvalidParameterException':
+                print(f"❌ Invalid parameter for secret '{secret_name}': {error_message}")
+            elif error_code == 'DecryptionFailureException':
+                print(f"❌ Decryption failure for secret '{secret_name}': {error_message}")
+            elif error_code == 'AccessDeniedException':
+                print(f"❌ Access denied for secret '{secret_name}'")
+                print(f"   Current IAM role/user may not have permission to access this secret")
+            elif error_code == 'InternalServiceErrorException':
+                print(f"❌ Internal service error for secret '{secret_name}': {error_message}")
+            else:
+                print(f"❌ Error retrieving secret '{secret_name}': {error_code} - {error_message}")
+            return None
+        except Exception as e:
+            print(f"Unexpected error retrieving secret {secret_name}: {e}")
+            return None
+
+
+class StaticSecretSource(SecretSource):
+    """In-memory secret source for tests and local runs."""
+
+    def __init__(self, secrets: Optional[Dict[str, Dict[str, Any]]] = None):
+        self.secrets = dict(secrets or {})
+        self.fetches = 0
+
+    def put(self, secret_name: str, value: Dict[str, Any]):
+        """Set or replace a secret, as a rotation would."""
+        self.secrets[secret_name] = value
+
+    def fetch(self, secret_name: str) -> Optional[Dict[str, Any]]:
+        self.fetches += 1
+        value = self.secrets.get(secret_name)
+        return dict(value) if value is not None else None
+
+
+class SecretProvider:
+    """
+    TTL cache in front of a secret source, with optional background refresh.
+
+    Reads are served from memory while fresh. When a refresh fails, the last
+    known value is kept. Subscribers are called when a refresh returns a
+    different value, so credentials can be rotated without a restart.
+    """
+
+    def __init__(
+        self,
+        source: SecretSource,
+        ttl: float = SECRETS_CACHE_TTL,
+        refresh_interval: float = SECRETS_REFRESH_INTERVAL,
+    ):
+        self.source = source
+        self.ttl = ttl
+        self.refresh_interval = refresh_interval
+        self._values: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._subscribers: Dict[str, List[Callable[[Dict[str, Any]], None]]] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def get(self, secret_name: str) -> Optional[Dict[str, Any]]:
+        """Return the secret, fetching it if missing or older than the TTL."""
+        with self._lock:
+            cached = self._values.get(secret_name)
+        if cached is not None and time.monotonic() - cached[0] < self.ttl:
+            return dict(cached[1])
+        value = self.refresh(secret_name)
+        if value is None and cached is not None:
+            return dict(cached[1])
+        return value
+
+    def refresh(self, secret_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Fetch ``secret_name`` now and notify subscribers if it changed.
+
+        Returns:
+            The new value, or None if the source returned nothing
+        """
+        value = self.source.fetch(secret_name)
+        if value is None:
+            return None
+        with self._lock:
+            previous = self._values.get(secret_name)
+            self._values[secret_name] = (time.monotonic(), value)
+            subscribers = list(self._subscribers.get(secret_name, ()))
+        if previous is not None and previous[1] != value:
+            for callback in subscribers:
+                try:
+                    callback(dict(value))
+                except Exception as e:
+                    print(f"⚠️  Secret rotation handler for '{secret_name}' failed: {e}")
+        return dict(value)
+
+    def subscribe(self, secret_name: str, callback: Callable[[Dict[str, Any]], None]):
+        """Call ``callback`` with the new value whenever ``secret_name`` changes."""
+        with self._lock:
+            self._subscribers.setdefault(secret_name, []).append(callback)
+
+    def refresh_all(self):
+        """Refresh every secret read so far."""
+        with self._lock:
+            names = list(self._values)
+        for name in names:
+            self.refresh(name)
+
+    def start(self):
+        """Refresh known secrets every ``refresh_interval`` seconds in a daemon thread."""
+        if self._thread is not None or self.refresh_interval <= 0:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="secret-refresh", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the refresh thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.refresh_interval):
+            try:
+                self.refresh_all()
+            except Exception as e:
+                print(f"⚠️  Secret refresh failed: {e}")
+
+
+_providers: Dict[str, SecretProvider] = {}
+_providers_lock = threading.Lock()
+
+
+def get_secret_provider(region_name: str = DEFAULT_REGION) -> SecretProvider:
+    """Return the shared provider for ``region_name``, creating it on first use."""
+    with _providers_lock:
+        provider = _providers.get(region_name)
+        if provider is None:
+            provider = _providers[region_name] = SecretProvider(AWSSecretSource(region_name))
+        return provider
+
+
+def set_secret_provider(provider: SecretProvider, region_name: str = DEFAULT_REGION):
+    """Install ``provider`` for ``region_name``, e.g. one backed by :class:`StaticSecretSource`."""
+    with _providers_lock:
+        _providers[region_name] = provider
+
+
+def get_secret(secret_name: str, region_name: str = DEFAULT_REGION) -> Optional[Dict[str, Any]]:
+    """
+    Retrieve secret from AWS Secrets Manager.
+
+    Values are cached for SECRETS_CACHE_TTL seconds. An installed provider
+    (see :func:`set_secret_provider`) is used even when AWS is not enabled.
+
+    Args:
+        secret_name: Name of the secret in AWS Secrets Manager
+        region_name: AWS region name (default: ap-northeast-2)
+
+    Returns:
+        Dictionary containing secret values, or None if retrieval fails
+    """
+    with _providers_lock:
+        installed = region_name in _providers
+    if not installed and not aws_secrets_enabled():
+        # In local development without AWS env, return None to use environment variables
         return None
+    return get_secret_provider(region_name).get(secret_name)
 
 
 def get_github_token() -> Optional[str]:
@@ -119,34 +301,53 @@ def get_postgres_credentials() -> Optional[Dict[str, str]]:
     Returns:
         Dictionary with keys: host, port, user, password, dbname
     """
-    secret = get_secret("prod/ignite-pilot/postgresInfo2")
+    secret = get_secret(POSTGRES_SECRET_NAME)
     if secret:
-        # Debug: print available keys (only in debug mode)
-        if os.getenv("DEBUG_SECRETS", "false").lower() == "true":
-            print(f"🔍 Available keys in secret: {list(secret.keys())}")
-        
-        # Try various possible key names (prioritize DB_* format)
-        # DB_NAME might not be in secret, so fallback to environment variable or project name
-        # Project name is memo-test1 (with hyphen), use that as default
-        db_name = (secret.get("DB_NAME") or secret.get("DBNAME") or secret.get("dbname") or 
-                  secret.get("database") or secret.get("DATABASE") or secret.get("DbName") or 
-                  secret.get("Database") or secret.get("dbName") or secret.get("db_name") or
-                  os.getenv("DB_NAME", "memo-test1"))
-        
-        return {
-            "host": (secret.get("DB_HOST") or secret.get("host") or secret.get("HOST") or 
-                    secret.get("hostname") or secret.get("Host") or secret.get("HOSTNAME") or 
-                    secret.get("endpoint") or secret.get("Endpoint") or secret.get("address") or 
-                    secret.get("Address")),
-            "port": (secret.get("DB_PORT") or secret.get("port") or secret.get("PORT") or 
-                    secret.get("Port") or "5432"),
-            "user": (secret.get("DB_USER") or secret.get("user") or secret.get("USER") or 
-                    secret.get("username") or secret.get("USERNAME") or secret.get("User") or 
-                    secret.get("Username") or secret.get("dbUser") or secret.get("db_user")),
-            "password": (secret.get("DB_PASSWORD") or secret.get("password") or 
-                        secret.get("PASSWORD") or secret.get("Password") or
-                        secret.get("dbPassword") or secret.get("db_password")),
-            "dbname": db_name
-        }
+        return parse_postgres_secret(secret)
     return None
 
+
+def parse_postgres_secret(secret: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Normalize a PostgreSQL secret to the keys host, port, user, password, dbname.
+
+    Args:
+        secret: Raw secret value with any of the supported key spellings
+
+    Returns:
+        Dictionary with keys: host, port, user, password, dbname
+    """
+    # Debug: print available keys (only in debug mode)
+    if os.getenv("DEBUG_SECRETS", "false").lower() == "true":
+        print(f"🔍 Available keys in secret: {list(secret.keys())}")
+    
+    # Try various possible key names (prioritize DB_* format)
+    # DB_NAME might not be in secret, so fallback to environment variable or project name
+    # Project name is memo-test1 (with hyphen), use that as default
+    db_name = (secret.get("DB_NAME") or secret.get("DBNAME") or secret.get("dbname") or 
+              secret.get("database") or secret.get("DATABASE") or secret.get("DbName") or 
+              secret.get("Database") or secret.get("dbName") or secret.get("db_name") or
+              os.getenv("DB_NAME", "memo-test1"))
+    
+    return {
+        "host": (secret.get("DB_HOST") or secret.get("host") or secret.get("HOST") or 
+                secret.get("hostname") or secret.get("Host") or secret.get("HOSTNAME") or 
+                secret.get("endpoint") or secret.get("Endpoint") or secret.get("address") or 
+                secret.get("Address")),
+        "port": (secret.get("DB_PORT") or secret.get("port") or secret.get("PORT") or 
+                secret.get("Port") or "5432"),
+        "user": (secret.get("DB_USER") or secret.get("user") or secret.get("USER") or 
+                secret.get("username") or secret.get("USERNAME") or secret.get("User") or 
+                secret.get("Username") or secret.get("dbUser") or secret.get("db_user")),
+        "password": (secret.get("DB_PASSWORD") or secret.get("password") or 
+                    secret.get("PASSWORD") or secret.get("Password") or
+                    secret.get("dbPassword") or secret.get("db_password")),
+        "dbname": db_name
+    }
+
+
+def watch_postgres_credentials(callback: Callable[[Dict[str, str]], None]):
+    """Call ``callback`` with the normalized credentials whenever the PostgreSQL secret rotates."""
+    get_secret_provider().subscribe(
+        POSTGRES_SECRET_NAME, lambda secret: callback(parse_postgres_secret(secret))
+    )
@@ -0,0 +1,33 @@
+"""Startup phase timing."""
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+# When the application started importing; app.main imports this module first
+IMPORT_STARTED = time.perf_counter()
+
+
+class StartupTimer:
+    """Records how long each startup phase takes and prints a one-line report."""
+
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as ``name``."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = (time.perf_counter() - start) * 1000
+
+    def mark(self, name: str, since: float):
+        """Record a phase that began at ``since`` (a ``time.perf_counter()`` value) and ends now."""
+        self.phases[name] = (time.perf_counter() - since) * 1000
+
+    def report(self) -> str:
+        """Format the total and per-phase durations."""
+        total = sum(self.phases.values())
+        phases = ", ".join(f"{name}: {ms:.1f}ms" for name, ms in self.phases.items())
+        return f"🚀 Startup completed in {total:.1f}ms ({phases})"
@@ -0,0 +1,141 @@
+"""Static file serving for the bundled single-page app."""
+import hashlib
+import os
+from mimetypes import guess_type
+from typing import Dict, Optional, Tuple
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+from app.compression import negotiate_encoding
+
+# Vite fingerprints every file under /assets, so their content never changes
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# index.html references the current asset hashes and must always be revalidated
+INDEX_CACHE_CONTROL = "no-cache"
+# Precompressed sibling suffix per content coding, in order of preference
+PRECOMPRESSED_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """
+    StaticFiles that serves ``.br``/``.gz`` siblings of build outputs.
+
+    The sibling lookup for each file is done once and remembered, and
+    every response carries a long-lived immutable Cache-Control header.
+    Conditional requests are answered by StaticFiles' ETag and
+    Last-Modified checks.
+    """
+
+    def __init__(self, *args, cache_control: str = IMMUTABLE_CACHE_CONTROL, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cache_control = cache_control
+        self._variants: Dict[str, Dict[str, Tuple[str, os.stat_result]]] = {}
+
+    def _find_variants(self, full_path: str) -> Dict[str, Tuple[str, os.stat_result]]:
+        variants = self._variants.get(full_path)
+        if variants is None:
+            variants = {}
+            for coding, suffix in PRECOMPRESSED_SUFFIXES.items():
+                try:
+                    variants[coding] = (full_path + suffix, os.stat(full_path + suffix))
+                except OSError:
+                    pass
+            self._variants[full_path] = variants
+        return variants
+
+    def file_response(
+        self,
+        full_path: str,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        request_headers = Headers(scope=scope)
+        headers = {"Cache-Control": self.cache_control}
+        path = str(full_path)
+        variants = self._find_variants(path)
+        if variants:
+            headers["Vary"] = "Accept-Encoding"
+            coding = negotiate_encoding(
+                request_headers.get("accept-encoding", ""), tuple(variants)
+            )
+            if coding is not None:
+                path, stat_result = variants[coding]
+                headers["Content-Encoding"] = coding
+
+        response = FileResponse(
+            path,
+            status_code=status_code,
+            headers=headers,
+            media_type=guess_type(str(full_path))[0] or "text/plain",
+            stat_result=stat_result,
+            method=scope["method"],
+        )
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
+class SPAIndex:
+    """
+    In-memory copy of the SPA ``index.html`` and its precompressed siblings.
+
+    Files are read once by :meth:`load`; responses are then built from
+    memory with an ETag so browsers can revalidate cheaply.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._bodies: Optional[Dict[Optional[str], bytes]] = None
+        self.etag = ""
+
+    def load(self) -> bool:
+        """
+        Read ``index.html`` and any ``.br``/``.gz`` siblings into memory.
+
+        Returns:
+            True if the index exists
+        """
+        if self._bodies is not None:
+            return bool(self._bodies)
+        bodies: Dict[Optional[str], bytes] = {}
+        try:
+            with open(self.path, "rb") as f:
+                bodies[None] = f.read()
+        except OSError:
+            self._bodies = {}
+            return False
+        for coding, suffix in PRECOMPRESSED_SUFFIXES.items():
+            try:
+                with open(self.path + suffix, "rb") as f:
+                    bodies[coding] = f.read()
+            except OSError:
+                pass
+        self.etag = '"' + hashlib.blake2b(bodies[None], digest_size=16).hexdigest() + '"'
+        self._bodies = bodies
+        return True
+
+    def response(self, request_headers: Headers) -> Optional[Response]:
+        """
+        Build the index response for a request.
+
+        Returns:
+            The response, or None if the frontend has not been built
+        """
+        if not self.load():
+            return None
+        codings = tuple(coding for coding in self._bodies if coding is not None)
+        coding = None
+        if codings:
+            coding = negotiate_encoding(request_headers.get("accept-encoding", ""), codings)
+        headers = {"Cache-Control": INDEX_CACHE_CONTROL, "Vary": "Accept-Encoding"}
+        # Each encoded representation gets its own strong validator
+        headers["ETag"] = self.etag if coding is None else f'{self.etag[:-1]}-{coding}"'
+        if coding is not None:
+            headers["Content-Encoding"] = coding
+
+        if_none_match = request_headers.get("if-none-match", "")
+        if headers["ETag"] in [tag.strip() for tag in if_none_match.split(",")]:
+            return Response(status_code=304, headers=headers)
+        return Response(self._bodies[coding], media_type="text/html", headers=headers)
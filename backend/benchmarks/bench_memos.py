@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Load-test and benchmark suite for the memo API.
+
+Seeds a configurable number of memos, then measures throughput and latency
+percentiles for each scenario at several concurrency levels against a
+running server. Results are written as JSON and can be compared with a
+previous run to catch regressions before deploying.
+
+Example:
+    uvicorn app.main:app --port 8501 &
+    python -m benchmarks.bench_memos --seed 100000 --concurrency 1,8,32 \\
+        --compare benchmarks/results/baseline.json
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+import httpx
+
+SCENARIOS = (
+    "list", "list_deep", "search", "create", "create_burst", "delete", "bulk_create", "bulk_delete",
+)
+BULK_SIZE = 100
+# Single creates fired at once per create_burst request; run the server with
+# MEMO_WRITE_BATCHING on and off and --compare to measure write batching
+BURST_SIZE = 50
+SEED_BATCH = 1000
+SEARCH_TERMS = ("alpha", "bravo", "charlie", "delta", "echo", "foxtrot", "golf", "hotel")
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(
+    scenario: str, concurrency: int, latencies: List[float], errors: int, elapsed: float
+) -> Dict[str, Any]:
+    """Build the result record for one scenario run."""
+    ordered = sorted(latencies)
+    return {
+        "scenario": scenario,
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": errors,
+        "duration_s": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(ordered, 50) * 1000, 3),
+        "p90_ms": round(percentile(ordered, 90) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3) if ordered else 0.0,
+    }
+
+
+def compare(
+    baseline: Dict[str, Any], current: Dict[str, Any], max_regression: float
+) -> List[str]:
+    """
+    Compare two result files.
+
+    Returns:
+        Descriptions of scenarios whose p99 latency grew, or throughput
+        dropped, by more than ``max_regression`` (a fraction)
+    """
+    previous = {(r["scenario"], r["concurrency"]): r for r in baseline.get("results", [])}
+    regressions = []
+    for result in current.get("results", []):
+        before = previous.get((result["scenario"], result["concurrency"]))
+        if not before:
+            continue
+        name = f"{result['scenario']}@{result['concurrency']}"
+        if before["p99_ms"] and result["p99_ms"] > before["p99_ms"] * (1 + max_regression):
+            regressions.append(f"{name}: p99 {before['p99_ms']}ms -> {result['p99_ms']}ms")
+        if before["throughput_rps"] and result["throughput_rps"] < before["throughput_rps"] * (1 - max_regression):
+            regressions.append(
+                f"{name}: throughput {before['throughput_rps']} -> {result['throughput_rps']} req/s"
+            )
+    return regressions
+
+
+class MemoBenchmark:
+    """Drives the memo API with concurrent workers."""
+
+    def __init__(self, client: httpx.AsyncClient, requests_per_level: int, warmup: int = 20):
+        self.client = client
+        self.requests_per_level = requests_per_level
+        self.warmup = warmup
+        self.deep_cursor: Optional[str] = None
+        self._counter = 0
+
+    def _next(self) -> int:
+        self._counter += 1
+        return self._counter
+
+    async def _check(self, response: httpx.Response):
+        if response.status_code >= 400:
+            raise RuntimeError(f"{response.request.method} {response.request.url} -> {response.status_code}")
+
+    async def seed(self, count: int):
+        """Insert ``count`` memos through the bulk endpoint."""
+        for start in range(0, count, SEED_BATCH):
+            items = [
+                {
+                    "title": f"seed memo {i}",
+                    "content": f"{SEARCH_TERMS[i % len(SEARCH_TERMS)]} benchmark content {i} " * 4,
+                }
+                for i in range(start, min(start + SEED_BATCH, count))
+            ]
+            await self._check(await self.client.post("/api/memos/bulk", json={"items": items}))
+        # A cursor a few pages deep exercises the keyset path, not just page one
+        cursor = None
+        for _ in range(5):
+            page = (await self.client.get("/api/memos", params={"cursor": cursor} if cursor else None)).json()
+            cursor = page.get("next_cursor") or cursor
+        self.deep_cursor = cursor
+
+    async def _create_ids(self, count: int) -> List[int]:
+        ids: List[int] = []
+        for start in range(0, count, SEED_BATCH):
+            items = [{"title": f"to delete {i}"} for i in range(start, min(start + SEED_BATCH, count))]
+            response = await self.client.post("/api/memos/bulk", json={"items": items})
+            await self._check(response)
+            ids.extend(m["id"] for m in response.json()["items"])
+        return ids
+
+    async def prepare(self, scenario: str) -> Callable[[], Awaitable[None]]:
+        """Return a coroutine factory issuing one request of ``scenario``."""
+        client = self.client
+        if scenario == "list":
+            async def op():
+                await self._check(await client.get("/api/memos"))
+        elif scenario == "list_deep":
+            params = {"cursor": self.deep_cursor} if self.deep_cursor else None
+
+            async def op():
+                await self._check(await client.get("/api/memos", params=params))
+        elif scenario == "search":
+            async def op():
+                term = SEARCH_TERMS[self._next() % len(SEARCH_TERMS)]
+                await self._check(await client.get("/api/memos/search", params={"q": term}))
+        elif scenario == "create":
+            async def op():
+                n = self._next()
+                await self._check(await client.post(
+                    "/api/memos", json={"title": f"bench {n}", "content": "benchmark"}
+                ))
+        elif scenario == "create_burst":
+            async def op():
+                n = self._next()
+                responses = await asyncio.gather(*(
+                    client.post("/api/memos", json={"title": f"burst {n}.{i}", "content": "benchmark"})
+                    for i in range(BURST_SIZE)
+                ))
+                for response in responses:
+                    await self._check(response)
+        elif scenario == "delete":
+            ids = await self._create_ids(self.requests_per_level + self.warmup)
+
+            async def op():
+                await self._check(await client.delete(f"/api/memos/{ids.pop()}"))
+        elif scenario == "bulk_create":
+            items = [{"title": f"bulk {i}", "content": "benchmark"} for i in range(BULK_SIZE)]
+
+            async def op():
+                await self._check(await client.post("/api/memos/bulk", json={"items": items}))
+        elif scenario == "bulk_delete":
+            ids = await self._create_ids((self.requests_per_level + self.warmup) * BULK_SIZE)
+
+            async def op():
+                batch = [ids.pop() for _ in range(BULK_SIZE)]
+                await self._check(await client.post("/api/memos/bulk-delete", json={"ids": batch}))
+        else:
+            raise ValueError(f"Unknown scenario '{scenario}'")
+        return op
+
+    async def run(self, scenario: str, concurrency: int) -> Dict[str, Any]:
+        """Run ``requests_per_level`` requests of ``scenario`` with ``concurrency`` workers."""
+        op = await self.prepare(scenario)
+        for _ in range(self.warmup):
+            try:
+                await op()
+            except (httpx.HTTPError, RuntimeError):
+                pass
+        remaining = self.requests_per_level
+        latencies: List[float] = []
+        errors = 0
+
+        async def worker():
+            nonlocal remaining, errors
+            while remaining > 0:
+                remaining -= 1
+                start = time.perf_counter()
+                try:
+                    await op()
+                except (httpx.HTTPError, RuntimeError):
+                    errors += 1
+                    continue
+                latencies.append(time.perf_counter() - start)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return summarize(scenario, concurrency, latencies, errors, time.perf_counter() - started)
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def main_async(args: argparse.Namespace) -> Dict[str, Any]:
+    levels = [int(level) for level in args.concurrency.split(",")]
+    scenarios = args.scenarios.split(",")
+    connections = max(levels + [BURST_SIZE] if "create_burst" in scenarios else levels)
+    limits = httpx.Limits(max_connections=connections, max_keepalive_connections=connections)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client:
+        bench = MemoBenchmark(client, args.requests, args.warmup)
+        print(f"🌱 Seeding {args.seed} memos...")
+        await bench.seed(args.seed)
+        results = []
+        for scenario in scenarios:
+            for concurrency in levels:
+                result = await bench.run(scenario, concurrency)
+                results.append(result)
+                print(
+                    f"  {scenario:<12} c={concurrency:<4} {result['throughput_rps']:>9} req/s  "
+                    f"p50={result['p50_ms']}ms p99={result['p99_ms']}ms errors={result['errors']}"
+                )
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "base_url": args.base_url,
+            "seed": args.seed,
+            "requests_per_level": args.requests,
+            "warmup": args.warmup,
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+        },
+        "results": results,
+    }
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default=os.getenv("BENCH_BASE_URL", "http://localhost:8501"))
+    parser.add_argument("--seed", type=int, default=10000, help="Memos to insert before measuring")
+    parser.add_argument("--requests", type=int, default=1000, help="Requests per scenario and level")
+    parser.add_argument("--warmup", type=int, default=20, help="Unmeasured requests before each run")
+    parser.add_argument("--concurrency", default="1,8,32", help="Comma-separated concurrency levels")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="Comma-separated scenarios")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds")
+    parser.add_argument("--output", help="Result JSON path (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--compare", help="Previous result JSON to check for regressions")
+    parser.add_argument(
+        "--max-regression", type=float, default=0.2,
+        help="Allowed p99/throughput regression as a fraction (default: 0.2)"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    report = asyncio.run(main_async(args))
+
+    output = args.output or os.path.join(
+        os.path.dirname(__file__), "results",
+        datetime.now(timezone.utc).strftime("bench-%Y%m%dT%H%M%SZ.json"),
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"📄 Results written to {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(json.load(f), report, args.max_regression)
+        if regressions:
+            print("❌ Regressions against baseline:")
+            for line in regressions:
+                print(f"   {line}")
+            return 1
+        print("✅ No regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
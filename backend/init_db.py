@@ -9,6 +9,8 @@ from app.database import init_db
 
 if __name__ == "__main__":
     print("Initializing database...")
-    init_db()
-    print("Database initialized successfully!")
+    version = init_db(apply_pending=True)
+    if version is None:
+        sys.exit(1)
+    print(f"Database initialized successfully! (schema version {version})")
 
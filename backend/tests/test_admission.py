@@ -0,0 +1,105 @@
+"""Tests for admission control."""
+import asyncio
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app import admission
+from app.admission import (
+    AdmissionMiddleware,
+    ConcurrencyLimiter,
+    TokenBucketLimiter,
+    client_key,
+    route_class,
+)
+
+
+def _app(**kwargs) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/api/memos")
+    async def memos():
+        return {"ok": True}
+
+    @app.get("/api/health/ready")
+    async def ready():
+        return {"status": "ok"}
+
+    app.add_middleware(AdmissionMiddleware, **kwargs)
+    return app
+
+
+def test_route_class():
+    """Test requests are classified by path and method, with probes and streams bypassing."""
+    assert route_class("GET", "/api/memos") == "read"
+    assert route_class("GET", "/api/memos/search") == "read"
+    assert route_class("POST", "/api/memos") == "write"
+    assert route_class("DELETE", "/api/memos/1") == "write"
+    assert route_class("POST", "/api/memos/bulk-delete") == "bulk"
+    assert route_class("GET", "/api/memos/export") == "bulk"
+    for method, path in [
+        ("GET", "/api/health/ready"), ("GET", "/metrics"), ("GET", "/api/memos/stream"),
+        ("GET", "/assets/app.js"), ("OPTIONS", "/api/memos"),
+    ]:
+        assert route_class(method, path) is None
+
+
+def test_client_key_uses_load_balancer_address():
+    """Test only the last X-Forwarded-For entry, added by the load balancer, is trusted."""
+    scope = {"headers": [(b"x-forwarded-for", b"1.1.1.1, 10.0.0.7")], "client": ("10.0.0.1", 1)}
+    assert client_key(scope) == "10.0.0.7"
+    assert client_key({"headers": [], "client": ("10.0.0.1", 1)}) == "10.0.0.1"
+
+
+def test_token_bucket_allows_burst_then_rate():
+    """Test a client may burst, then waits for refills, independently of other clients."""
+    bucket = TokenBucketLimiter(rate=10, burst=2)
+    assert bucket.take("a") == 0
+    assert bucket.take("a") == 0
+    assert 0 < bucket.take("a") <= 0.1
+    assert bucket.take("b") == 0
+
+
+async def test_concurrency_limiter_queues_then_sheds():
+    """Test waiters get freed slots in order, and a full or slow queue sheds requests."""
+    limiter = ConcurrencyLimiter("read", limit=1, max_queue=1, queue_timeout=0.05)
+    assert await limiter.acquire() is None
+
+    waiter = asyncio.ensure_future(limiter.acquire())
+    await asyncio.sleep(0)
+    assert limiter.queue_depth == 1
+    assert await limiter.acquire() == "queue_full"
+    limiter.release()
+    assert await waiter is None
+    assert limiter.in_flight == 1
+
+    assert await limiter.acquire() == "queue_timeout"
+    limiter.release()
+    assert limiter.in_flight == 0 and limiter.queue_depth == 0
+
+
+def test_middleware_rejects_with_retry_after():
+    """Test rate-limited clients get 429 and overloaded classes 503, while probes pass."""
+    limited = TestClient(_app(client_rate=1, client_burst=1))
+    assert limited.get("/api/memos").status_code == 200
+    response = limited.get("/api/memos")
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == "1"
+    assert limited.get("/api/health/ready").status_code == 200
+
+    full = {"read": ConcurrencyLimiter("read", limit=0, max_queue=0, queue_timeout=1)}
+    overloaded = TestClient(_app(limiters=full, client_rate=0, retry_after=3))
+    response = overloaded.get("/api/memos")
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "3"
+    assert overloaded.get("/api/health/ready").status_code == 200
+
+
+def test_default_limits_fit_the_database_pool(monkeypatch):
+    """Test the default class limits fit the pool, and larger configured ones are refused."""
+    limits = {name: limiter.limit for name, limiter in admission._default_limiters().items()}
+    assert sum(limits.values()) <= admission.DB_POOL_CAPACITY
+    assert min(limits.values()) >= 1
+
+    monkeypatch.setattr(admission, "ADMISSION_MAX_IN_FLIGHT_READ", admission.DB_POOL_CAPACITY)
+    with pytest.raises(ValueError, match="DB_POOL_SIZE"):
+        admission._default_limiters()
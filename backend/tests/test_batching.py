@@ -0,0 +1,60 @@
+"""Tests for write batching."""
+import asyncio
+from sqlalchemy.exc import IntegrityError
+from app.batching import WriteBatcher
+
+
+class FakeSession:
+    def __init__(self):
+        self.rollbacks = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+def _fail_on(bad):
+    def write_one(db, item):
+        if item == bad:
+            raise IntegrityError("INSERT", {}, Exception("bad item"))
+        return item * 10
+    return write_one
+
+
+async def test_batches_until_full_or_window():
+    """Test concurrent submits share batches capped at max_size, each getting its own result."""
+    calls = []
+
+    def write_many(db, items):
+        calls.append(list(items))
+        return [item * 10 for item in items]
+
+    batcher = WriteBatcher(write_many, _fail_on(None), FakeSession, max_size=3, window=0.05)
+    results = await asyncio.gather(*(batcher.submit(i) for i in range(5)))
+
+    assert results == [0, 10, 20, 30, 40]
+    assert calls == [[0, 1, 2], [3, 4]]
+    assert (batcher.batches, batcher.items) == (2, 5)
+
+    # A lone submit is written once the window passes
+    assert await batcher.submit(7) == 70
+    assert calls[-1] == [7]
+
+
+async def test_failed_batch_is_retried_one_by_one():
+    """Test a bad item fails only its own submit when the batch insert fails."""
+    def write_many(db, items):
+        raise IntegrityError("INSERT", {}, Exception("batch failed"))
+
+    batcher = WriteBatcher(write_many, _fail_on(2), FakeSession, max_size=10, window=0.01)
+    results = await asyncio.gather(*(batcher.submit(i) for i in range(4)), return_exceptions=True)
+
+    assert results[:2] == [0, 10]
+    assert isinstance(results[2], IntegrityError)
+    assert results[3] == 30
+    assert batcher.fallbacks == 1
@@ -0,0 +1,18 @@
+"""Tests for the benchmark result helpers."""
+from benchmarks.bench_memos import compare, percentile, summarize
+
+
+def test_percentile_nearest_rank():
+    """Test nearest-rank percentiles."""
+    values = [float(i) for i in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([], 50) == 0.0
+
+
+def test_compare_flags_regressions():
+    """Test p99 growth and throughput drops beyond the threshold are reported."""
+    baseline = {"results": [summarize("list", 8, [0.010] * 100, 0, 1.0)]}
+    slower = {"results": [summarize("list", 8, [0.020] * 50, 0, 1.0)]}
+    assert len(compare(baseline, slower, 0.2)) == 2
+    assert compare(baseline, baseline, 0.2) == []
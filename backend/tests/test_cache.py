@@ -0,0 +1,260 @@
+"""Tests for the memo read cache."""
+import json
+import os
+import socketserver
+import threading
+import time
+import psycopg2
+import pytest
+from app.cache import MemoryCache
+from app.invalidation import CHANNEL, InvalidationListener
+from app.redis_cache import RedisCache
+
+
+def test_get_set_and_stats():
+    """Test hits and misses are counted."""
+    cache = MemoryCache(max_entries=10, ttl=60)
+    assert cache.get("a") is None
+    cache.set("a", b"1")
+    assert cache.get("a") == b"1"
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["entries"] == 1
+
+
+def test_lru_eviction():
+    """Test the least recently used entry is evicted first."""
+    cache = MemoryCache(max_entries=2, ttl=60)
+    cache.set("a", b"1")
+    cache.set("b", b"2")
+    cache.get("a")
+    cache.set("c", b"3")
+    assert cache.get("b") is None
+    assert cache.get("a") == b"1"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_expiry():
+    """Test entries expire after the TTL."""
+    cache = MemoryCache(max_entries=10, ttl=0)
+    cache.set("a", b"1")
+    assert cache.get("a") is None
+
+
+def test_per_entry_ttl():
+    """Test an entry's own TTL can shorten, but not extend, the cache TTL."""
+    cache = MemoryCache(max_entries=10, ttl=60)
+    cache.set("short", b"1", ttl=0)
+    cache.set("long", b"2", ttl=3600)
+    assert cache.get("short") is None
+    assert cache._entries["long"][1] <= time.monotonic() + 60
+
+
+def test_invalidate_tags():
+    """Test only entries carrying an invalidated tag are dropped."""
+    cache = MemoryCache(max_entries=10, ttl=60)
+    cache.set("page1", b"1", tags=["memo:1", "memo:2"])
+    cache.set("page2", b"2", tags=["memo:3"])
+    cache.invalidate_tags(["memo:2"])
+    assert cache.get("page1") is None
+    assert cache.get("page2") == b"2"
+
+
+def test_stale_generation_not_stored():
+    """Test a value read before an invalidation is not cached after it."""
+    cache = MemoryCache(max_entries=10, ttl=60)
+    generation = cache.generation()
+    cache.invalidate_tags(["memo:1"])
+    cache.set("page1", b"stale", tags=["memo:1"], generation=generation)
+    assert cache.get("page1") is None
+
+
+class FakeRespServer:
+    """In-memory server speaking the subset of RESP used by RedisCache."""
+
+    def __init__(self):
+        self.data = {}
+        self.server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), self._handler())
+        self.server.daemon_threads = True
+        self.url = f"redis://127.0.0.1:{self.server.server_address[1]}/0"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _handler(self):
+        data = self.data
+
+        def bulk(value):
+            return b"$-1\r\n" if value is None else b"$%d\r\n%s\r\n" % (len(value), value)
+
+        def array(values):
+            return b"*%d\r\n" % len(values) + b"".join(bulk(v) for v in values)
+
+        def run(cmd, args):
+            if cmd == b"GET":
+                return bulk(data.get(args[0]))
+            if cmd == b"SET":
+                data[args[0]] = args[1]
+                return b"+OK\r\n"
+            if cmd == b"DEL":
+                return b":%d\r\n" % sum(data.pop(k, None) is not None for k in args)
+            if cmd == b"INCR":
+                data[args[0]] = str(int(data.get(args[0], 0)) + 1).encode()
+                return b":%s\r\n" % data[args[0]]
+            if cmd == b"SADD":
+                data.setdefault(args[0], set()).update(args[1:])
+                return b":1\r\n"
+            if cmd == b"SMEMBERS":
+                return array(sorted(data.get(args[0], set())))
+            if cmd == b"PEXPIRE":
+                return b":1\r\n"
+            if cmd == b"EVAL":
+                # Emulates SET_IF_GENERATION, which the server runs atomically
+                numkeys = int(args[1])
+                keys = args[2:2 + numkeys]
+                expected, value, _ = args[2 + numkeys:]
+                if expected and data.get(keys[0], b"0") != expected:
+                    return b":0\r\n"
+                data[keys[1]] = value
+                for tag_key in keys[2:]:
+                    data.setdefault(tag_key, set()).add(keys[1])
+                return b":1\r\n"
+            if cmd == b"SCAN":
+                prefix = args[2].rstrip(b"*")
+                return b"*2\r\n" + bulk(b"0") + array([k for k in data if k.startswith(prefix)])
+            return b"-ERR unknown command\r\n"
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                while True:
+                    line = self.rfile.readline()
+                    if not line:
+                        return
+                    args = []
+                    for _ in range(int(line[1:])):
+                        length = int(self.rfile.readline()[1:])
+                        args.append(self.rfile.read(length + 2)[:-2])
+                    self.wfile.write(run(args[0].upper(), args[1:]))
+
+        return Handler
+
+
+@pytest.fixture
+def redis_cache():
+    """RedisCache connected to a local fake server."""
+    server = FakeRespServer()
+    cache = RedisCache(server.url, ttl=60)
+    yield cache
+    cache.client.close()
+    server.close()
+
+
+def test_redis_get_set(redis_cache):
+    """Test values round-trip through the Redis backend."""
+    assert redis_cache.get("a") is None
+    redis_cache.set("a", b"payload", tags=["memo:1"])
+    assert redis_cache.get("a") == b"payload"
+    assert redis_cache.stats()["hits"] == 1
+
+
+def test_redis_invalidate_tags(redis_cache):
+    """Test tag invalidation is shared by every client of the server."""
+    other = RedisCache(f"redis://{redis_cache.client.host}:{redis_cache.client.port}/0", ttl=60)
+    redis_cache.set("page1", b"1", tags=["memo:1"])
+    redis_cache.set("page2", b"2", tags=["memo:2"])
+    other.invalidate_tags(["memo:1"])
+    assert redis_cache.get("page1") is None
+    assert redis_cache.get("page2") == b"2"
+    other.client.close()
+
+
+def test_redis_stale_generation_not_stored(redis_cache):
+    """Test a value read before an invalidation is not cached after it."""
+    generation = redis_cache.generation()
+    redis_cache.invalidate_tags(["memo:1"])
+    redis_cache.set("page1", b"stale", tags=["memo:1"], generation=generation)
+    assert redis_cache.get("page1") is None
+
+
+def test_redis_unreachable_degrades_to_miss():
+    """Test an unreachable server behaves as an empty cache."""
+    cache = RedisCache("redis://127.0.0.1:1/0", ttl=60, timeout=0.1)
+    cache.set("a", b"1")
+    assert cache.get("a") is None
+    assert cache.stats()["errors"] > 0
+
+
+def test_redis_unreachable_is_skipped_until_backoff_passes(monkeypatch):
+    """Test a failed connection makes later calls skip the server instead of retrying it."""
+    cache = RedisCache("redis://127.0.0.1:1/0", ttl=60, timeout=0.1)
+    attempts = []
+    connect = cache.client._connect
+    monkeypatch.setattr(cache.client, "_connect", lambda: attempts.append(1) or connect())
+
+    assert cache.get("a") is None
+    assert not cache.client.available
+    assert cache.get("a") is None
+    cache.set("a", b"1")
+    assert len(attempts) == 1
+
+    cache.client._retry_at = 0.0
+    assert cache.get("a") is None
+    assert len(attempts) == 2
+
+
+async def test_redis_async_calls_run_off_the_event_loop(redis_cache, monkeypatch):
+    """Test async cache calls do their socket I/O on the cache thread pool."""
+    threads = []
+    get = redis_cache.get
+    monkeypatch.setattr(
+        redis_cache, "get", lambda key: threads.append(threading.current_thread().name) or get(key)
+    )
+    await redis_cache.aset("a", b"payload", ["memo:1"], await redis_cache.ageneration())
+    assert await redis_cache.aget("a") == b"payload"
+    assert threads[0].startswith("memo-cache")
+
+
+def test_listener_reconnect_clears_only_local_cache(redis_cache):
+    """Test a listener reconnect empties an in-process cache but not the shared one."""
+    local = MemoryCache(max_entries=10, ttl=60)
+    local.set("a", b"1")
+    redis_cache.set("a", b"1")
+    InvalidationListener("", local).on_connect()
+    InvalidationListener("", redis_cache).on_connect()
+    assert local.get("a") is None
+    assert redis_cache.get("a") == b"1"
+
+
+@pytest.mark.skipif(not os.getenv("TEST_DATABASE_URL"), reason="TEST_DATABASE_URL is required")
+def test_invalidation_listener_applies_notifications():
+    """Test notices from another task invalidate the local cache."""
+    dsn = os.getenv("TEST_DATABASE_URL")
+    cache = MemoryCache(max_entries=10, ttl=60)
+    listener = InvalidationListener(dsn, cache, poll_interval=0.1)
+    listener.start()
+    try:
+        deadline = time.monotonic() + 5
+        cache.set("page1", b"1", tags=["memo:1"])
+        # The listener clears the cache once it is subscribed
+        while cache.get("page1") is not None and time.monotonic() < deadline:
+            time.sleep(0.05)
+        cache.set("page1", b"1", tags=["memo:1"])
+
+        conn = psycopg2.connect(dsn)
+        conn.autocommit = True
+        with conn.cursor() as cur:
+            cur.execute(
+                "SELECT pg_notify(%s, %s)",
+                (CHANNEL, json.dumps({"origin": "other-task", "tags": ["memo:1"]}))
+            )
+        conn.close()
+
+        while cache.get("page1") is not None and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert cache.get("page1") is None
+        assert listener.received == 1
+    finally:
+        listener.stop()
@@ -0,0 +1,89 @@
+"""Tests for response compression."""
+import gzip
+import brotli
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+from app.compression import CompressionMiddleware, negotiate_encoding
+
+PAYLOAD = b'{"items": [' + b'{"title": "memo"},' * 200 + b"{}]}"
+
+app = FastAPI()
+app.add_middleware(CompressionMiddleware, minimum_size=100)
+
+
+@app.get("/json")
+async def json_body():
+    return Response(PAYLOAD, media_type="application/json", headers={"ETag": '"abc"'})
+
+
+@app.get("/small")
+async def small_body():
+    return Response(b"{}", media_type="application/json")
+
+
+@app.get("/stream")
+async def stream_body():
+    async def chunks():
+        for _ in range(3):
+            yield PAYLOAD
+    return StreamingResponse(chunks(), media_type="application/x-ndjson")
+
+
+@app.get("/events")
+async def events():
+    return PlainTextResponse("data: x\n\n" * 100, media_type="text/event-stream")
+
+
+client = TestClient(app)
+
+
+def test_negotiate_encoding():
+    """Test brotli is preferred and q=0 excludes a coding."""
+    assert negotiate_encoding("gzip, deflate, br") == "br"
+    assert negotiate_encoding("gzip, br;q=0") == "gzip"
+    assert negotiate_encoding("identity") is None
+    assert negotiate_encoding("*") == "br"
+
+
+def test_gzip_response():
+    """Test gzip is applied with Vary and a weakened ETag."""
+    response = client.get("/json", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.headers["etag"] == 'W/"abc"'
+    assert response.content == PAYLOAD
+
+
+def test_brotli_response():
+    """Test brotli is applied when accepted."""
+    response = client.get("/json", headers={"Accept-Encoding": "br"})
+    assert response.headers["content-encoding"] == "br"
+    assert int(response.headers["content-length"]) < len(PAYLOAD)
+
+
+def test_small_response_not_compressed():
+    """Test bodies under the threshold are sent as-is."""
+    response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+
+
+def test_streaming_response_compressed():
+    """Test streaming bodies are compressed chunk by chunk."""
+    response = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.content == PAYLOAD * 3
+
+
+def test_event_stream_not_compressed():
+    """Test server-sent events are never buffered by compression."""
+    response = client.get("/events", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+
+
+def test_raw_bodies_decode():
+    """Test the raw encoded bytes are valid gzip and brotli streams."""
+    with client.stream("GET", "/json", headers={"Accept-Encoding": "gzip"}) as response:
+        assert gzip.decompress(b"".join(response.iter_raw())) == PAYLOAD
+    with client.stream("GET", "/json", headers={"Accept-Encoding": "br"}) as response:
+        assert brotli.decompress(b"".join(response.iter_raw())) == PAYLOAD
@@ -0,0 +1,103 @@
+"""Tests for the memo change event stream."""
+import asyncio
+import json
+import os
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.database import Base
+from app.events import RESET_EVENT, MemoEvent, MemoEventBroker, MemoEventListener, publish_memo_event
+from app.models import Memo
+
+
+def _event(event_id: int) -> MemoEvent:
+    return MemoEvent(event_id, "deleted", json.dumps({"ids": [event_id]}))
+
+
+async def test_broker_replays_missed_events():
+    """Test a client resuming from a buffered id receives only later events."""
+    broker = MemoEventBroker(buffer_size=10)
+    for event_id in (5, 7, 6):
+        broker.publish(_event(event_id))
+
+    _, missed = broker.subscribe("7")
+    assert [event.id for event in missed] == [6]
+    _, unknown = broker.subscribe("1")
+    assert unknown == [RESET_EVENT]
+    _, fresh = broker.subscribe(None)
+    assert fresh == []
+
+
+async def test_stream_delivers_events_and_resets_slow_clients():
+    """Test live events reach the stream, and a client that falls behind is reset."""
+    broker = MemoEventBroker(queue_size=2)
+    stream = broker.stream(None, keepalive=0.05)
+    assert (await stream.__anext__()).startswith("retry:")
+
+    broker.publish(_event(1))
+    assert await stream.__anext__() == "id: 1\nevent: deleted\ndata: {\"ids\": [1]}\n\n"
+    assert await stream.__anext__() == ": keepalive\n\n"
+
+    for event_id in range(2, 6):
+        broker.publish(_event(event_id))
+    await asyncio.sleep(0)
+    assert "event: reset" in await stream.__anext__()
+    assert broker.client_count == 1
+    await stream.aclose()
+    assert broker.client_count == 0
+
+
+@pytest.mark.skipif(not os.getenv("TEST_DATABASE_URL"), reason="TEST_DATABASE_URL is required")
+async def test_listener_publishes_committed_changes():
+    """Test committed creates and deletes become events carrying memos and ids."""
+    dsn = os.getenv("TEST_DATABASE_URL")
+    engine = create_engine(dsn)
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    broker = MemoEventBroker()
+    listener = MemoEventListener(dsn, broker, Session, poll_interval=0.1)
+    stream = broker.stream(None, keepalive=0.1)
+    await stream.__anext__()
+
+    async def next_event() -> str:
+        while True:
+            message = await asyncio.wait_for(stream.__anext__(), 5)
+            if not message.startswith(":"):
+                return message
+
+    listener.start()
+    try:
+        # The listener resets clients once it is subscribed
+        assert "event: reset" in await asyncio.wait_for(stream.__anext__(), 5)
+
+        with Session() as db:
+            memo = Memo(title="Streamed")
+            db.add(memo)
+            db.flush()
+            publish_memo_event(db, "created", [memo.id])
+            db.rollback()
+        with Session() as db:
+            memo = Memo(title="Streamed")
+            db.add(memo)
+            db.flush()
+            memo_id = memo.id
+            publish_memo_event(db, "created", [memo_id])
+            db.commit()
+            # The listener loads created memos, so wait before deleting this one
+            created = await next_event()
+            db.delete(memo)
+            publish_memo_event(db, "deleted", [memo_id])
+            db.commit()
+        deleted = await next_event()
+
+        assert "event: created" in created
+        assert json.loads(created.split("data: ")[1])["memos"][0]["title"] == "Streamed"
+        assert "event: deleted" in deleted
+        assert json.loads(deleted.split("data: ")[1]) == {"ids": [memo_id]}
+        # Rolled-back changes are never announced
+        assert listener.received == 2
+    finally:
+        await stream.aclose()
+        listener.stop()
+        Base.metadata.drop_all(bind=engine)
+        engine.dispose()
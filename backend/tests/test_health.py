@@ -1,7 +1,10 @@
 """Tests for health check endpoint."""
+import os
 import pytest
 from fastapi.testclient import TestClient
 from app.main import app
+from app.database import get_engine
+from app.readiness import ReadinessProbe
 
 client = TestClient(app)
 
@@ -14,3 +17,43 @@ def test_health_check():
     assert data["status"] == "ok"
     assert data["message"] == "Service is healthy"
 
+
+def test_pool_status():
+    """Test connection pool statistics endpoint."""
+    response = client.get("/api/health/pool")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["checked_out"] >= 0
+    assert data["overflow"] <= data["max_overflow"]
+    assert data["timeouts"] >= 0
+
+
+def test_liveness_check():
+    """Test liveness endpoint."""
+    response = client.get("/api/health/live")
+    assert response.status_code == 200
+    assert response.json()["status"] == "ok"
+
+
+def test_readiness_before_first_check():
+    """Test readiness reports 503 until the background check has run."""
+    response = client.get("/api/health/ready")
+    assert response.status_code == 503
+    assert response.json()["status"] == "starting"
+
+
+def test_readiness_database_unreachable():
+    """Test an unreachable database makes the task not ready."""
+    probe = ReadinessProbe("postgresql://nobody@127.0.0.1:1/none", get_engine().pool, timeout=1)
+    result = probe.refresh()
+    assert result["status"] == "not_ready"
+    assert result["database"] is False
+    assert probe.snapshot()["status"] == "not_ready"
+
+
+@pytest.mark.skipif(not os.getenv("TEST_DATABASE_URL"), reason="TEST_DATABASE_URL is required")
+def test_readiness_database_reachable():
+    """Test a reachable database with an idle pool is ready."""
+    probe = ReadinessProbe(os.getenv("TEST_DATABASE_URL"), get_engine().pool)
+    assert probe.refresh()["status"] == "ready"
+    assert probe.snapshot()["database"] is True
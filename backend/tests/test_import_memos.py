@@ -0,0 +1,96 @@
+"""Tests for scripts/import_memos.py."""
+import importlib.util
+import io
+import os
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, insert, select, text
+from sqlalchemy.orm import sessionmaker
+from app.database import Base, get_db
+from app.main import app
+from app.models import Memo
+
+TEST_DB_URL = os.getenv("TEST_DATABASE_URL")
+if not TEST_DB_URL:
+    pytest.skip("TEST_DATABASE_URL environment variable is required for database tests", allow_module_level=True)
+
+SCRIPT = os.path.join(os.path.dirname(__file__), "../../scripts/import_memos.py")
+spec = importlib.util.spec_from_file_location("import_memos", SCRIPT)
+import_memos = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(import_memos)
+
+MEMOS = [
+    {"title": "Tab\tin title", "content": "col1\tcol2"},
+    {"title": "Newlines", "content": "line 1\nline 2\r\nline 3"},
+    {"title": "Backslashes", "content": "C:\\memo\\new \\N \\\\"},
+    {"title": "No content", "content": None},
+]
+
+
+@pytest.fixture
+def engine():
+    """Engine on a test database with the memos table, used by the API and the importer."""
+    engine = create_engine(TEST_DB_URL)
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+
+    def override_get_db():
+        with Session() as db:
+            yield db
+
+    previous = app.dependency_overrides.get(get_db)
+    app.dependency_overrides[get_db] = override_get_db
+    import_memos.get_engine = lambda: engine
+    yield engine
+    if previous is None:
+        app.dependency_overrides.pop(get_db, None)
+    else:
+        app.dependency_overrides[get_db] = previous
+    Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+
+
+def _rows(engine):
+    with engine.connect() as conn:
+        return [
+            tuple(row) for row in conn.execute(
+                select(Memo.id, Memo.title, Memo.content, Memo.created_at).order_by(Memo.id)
+            )
+        ]
+
+
+def test_export_round_trips_through_import(engine):
+    """Test exported memos with COPY special characters and NULL content import unchanged."""
+    with engine.begin() as conn:
+        conn.execute(insert(Memo), MEMOS)
+    exported = _rows(engine)
+    ndjson = TestClient(app).get("/api/memos/export").text
+
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM memos"))
+    assert import_memos.import_memos(io.StringIO(ndjson), batch_size=3) == len(MEMOS)
+    imported = _rows(engine)
+    # New ids, same memos in the same order
+    assert [row[1:] for row in imported] == [row[1:] for row in exported]
+    assert imported[0][0] > exported[-1][0]
+
+
+def test_import_keep_ids_skips_existing_and_advances_sequence(engine):
+    """Test --keep-ids keeps exported ids, skips ids already present and moves the id sequence past them."""
+    with engine.begin() as conn:
+        conn.execute(insert(Memo), MEMOS)
+    exported = _rows(engine)
+    ndjson = TestClient(app).get("/api/memos/export").text
+
+    with engine.begin() as conn:
+        conn.execute(text("TRUNCATE memos RESTART IDENTITY"))
+        conn.execute(insert(Memo), [{"id": exported[0][0], "title": "Already here"}])
+    assert import_memos.import_memos(io.StringIO(ndjson), batch_size=2, keep_ids=True) == len(MEMOS) - 1
+    imported = _rows(engine)
+    assert [row[0] for row in imported] == [row[0] for row in exported]
+    assert imported[0][1] == "Already here"
+    assert imported[1:] == exported[1:]
+
+    with engine.begin() as conn:
+        new_id = conn.execute(insert(Memo).values(title="After import").returning(Memo.id)).scalar()
+    assert new_id > exported[-1][0]
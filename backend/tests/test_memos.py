@@ -4,8 +4,11 @@ from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from app.main import app
+from app.cache import memo_cache
 from app.database import Base, get_db
+from app.routers.memos import DEFAULT_PAGE_SIZE
 import os
+import time
 
 # Use test database from environment variable
 TEST_DB_URL = os.getenv("TEST_DATABASE_URL")
@@ -32,6 +35,7 @@ app.dependency_overrides[get_db] = override_get_db
 def setup_database():
     """Setup test database."""
     Base.metadata.create_all(bind=engine)
+    memo_cache.clear()
     yield
     Base.metadata.drop_all(bind=engine)
 
@@ -61,8 +65,35 @@ def test_get_memos(setup_database):
     response = client.get("/api/memos")
     assert response.status_code == 200
     data = response.json()
-    assert isinstance(data, list)
-    assert len(data) > 0
+    assert isinstance(data["items"], list)
+    assert len(data["items"]) > 0
+    assert data["next_cursor"] is None
+
+
+def test_get_memos_pagination(setup_database):
+    """Test paging through memos with a cursor."""
+    for i in range(5):
+        client.post("/api/memos", json={"title": f"Memo {i}", "content": "Test"})
+
+    first = client.get("/api/memos", params={"limit": 3}).json()
+    assert len(first["items"]) == 3
+    assert first["next_cursor"]
+
+    second = client.get(
+        "/api/memos", params={"limit": 3, "cursor": first["next_cursor"]}
+    ).json()
+    assert len(second["items"]) == 2
+    assert second["next_cursor"] is None
+
+    ids = [m["id"] for m in first["items"] + second["items"]]
+    assert len(set(ids)) == 5
+    assert ids == sorted(ids, reverse=True)
+
+
+def test_get_memos_invalid_cursor(setup_database):
+    """Test that a malformed cursor is rejected."""
+    response = client.get("/api/memos", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
 
 
 def test_delete_memo(setup_database):
@@ -80,7 +111,7 @@ def test_delete_memo(setup_database):
     
     # Verify it's deleted
     get_response = client.get("/api/memos")
-    memos = get_response.json()
+    memos = get_response.json()["items"]
     assert not any(m["id"] == memo_id for m in memos)
 
 
@@ -89,3 +120,206 @@ def test_delete_nonexistent_memo(setup_database):
     response = client.delete("/api/memos/99999")
     assert response.status_code == 404
 
+
+def test_bulk_create_memos(setup_database):
+    """Test creating several memos in one request."""
+    response = client.post(
+        "/api/memos/bulk",
+        json={"items": [{"title": f"Memo {i}", "content": "Bulk"} for i in range(3)]}
+    )
+    assert response.status_code == 201
+    items = response.json()["items"]
+    assert [m["title"] for m in items] == ["Memo 0", "Memo 1", "Memo 2"]
+    assert all("id" in m and "created_at" in m for m in items)
+
+
+def test_bulk_delete_memos(setup_database):
+    """Test deleting several memos in one request with per-item results."""
+    created = client.post(
+        "/api/memos/bulk",
+        json={"items": [{"title": "A"}, {"title": "B"}]}
+    ).json()["items"]
+    ids = [m["id"] for m in created]
+
+    response = client.post("/api/memos/bulk-delete", json={"ids": ids + [99999]})
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert results == [
+        {"id": ids[0], "deleted": True},
+        {"id": ids[1], "deleted": True},
+        {"id": 99999, "deleted": False},
+    ]
+    assert client.get("/api/memos").json()["items"] == []
+
+
+def test_search_memos(setup_database):
+    """Test full-text search ranks matching memos and pages through them."""
+    client.post("/api/memos", json={"title": "grocery list", "content": "milk eggs"})
+    client.post("/api/memos", json={"title": "milk", "content": "buy milk and more milk"})
+    client.post("/api/memos", json={"title": "meeting notes", "content": "budget"})
+
+    response = client.get("/api/memos/search", params={"q": "milk"})
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert [m["title"] for m in items] == ["milk", "grocery list"]
+
+    first = client.get("/api/memos/search", params={"q": "milk", "limit": 1}).json()
+    assert first["next_cursor"]
+    second = client.get(
+        "/api/memos/search",
+        params={"q": "milk", "limit": 1, "cursor": first["next_cursor"]}
+    ).json()
+    assert [m["title"] for m in first["items"] + second["items"]] == ["milk", "grocery list"]
+    assert second["next_cursor"] is None
+
+
+def test_get_memos_cache_invalidation(setup_database):
+    """Test that cached pages are served and dropped on writes."""
+    client.post("/api/memos", json={"title": "First"})
+    client.get("/api/memos")
+    hits = memo_cache.stats()["hits"]
+    assert len(client.get("/api/memos").json()["items"]) == 1
+    assert memo_cache.stats()["hits"] == hits + 1
+
+    created = client.post("/api/memos", json={"title": "Second"}).json()
+    assert len(client.get("/api/memos").json()["items"]) == 2
+
+    client.delete(f"/api/memos/{created['id']}")
+    items = client.get("/api/memos").json()["items"]
+    assert [m["title"] for m in items] == ["First"]
+
+
+def test_get_memos_etag(setup_database):
+    """Test conditional list requests return 304 until the list changes."""
+    client.post("/api/memos", json={"title": "First"})
+    response = client.get("/api/memos")
+    etag = response.headers["etag"]
+
+    not_modified = client.get("/api/memos", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["etag"] == etag
+
+    client.post("/api/memos", json={"title": "Second"})
+    changed = client.get("/api/memos", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+
+
+def test_reads_follow_own_writes_with_replica(setup_database, monkeypatch):
+    """Test a client reads the primary right after its own write when a replica is configured."""
+    from app import database
+
+    # An unreachable replica: reads only succeed if they are routed to the primary
+    monkeypatch.setattr(database, "DB_READ_REPLICA_HOST", "replica.invalid")
+    monkeypatch.setattr(database, "_read_engine", create_engine("postgresql://u:p@replica.invalid/db"))
+    sticky = TestClient(app)
+
+    created = sticky.post("/api/memos", json={"title": "Mine"})
+    assert database.READ_YOUR_WRITES_COOKIE in created.cookies
+    response = sticky.get("/api/memos")
+    assert response.status_code == 200
+    assert [m["title"] for m in response.json()["items"]] == ["Mine"]
+
+
+def test_replica_reads_are_cached_briefly(setup_database, monkeypatch):
+    """Test pages read from a replica are cached with the short replica TTL."""
+    from app import database
+    from app.routers import memos as memos_router
+
+    client.post("/api/memos", json={"title": "Replicated"})
+    monkeypatch.setattr(database, "DB_READ_REPLICA_HOST", "replica.local")
+    monkeypatch.setattr(database, "_read_engine", create_engine(TEST_DB_URL))
+    monkeypatch.setattr(memos_router, "MEMO_CACHE_REPLICA_TTL", 0.2)
+    replica_client = TestClient(app)
+
+    memo = replica_client.get("/api/memos").json()["items"][0]
+    assert memo["title"] == "Replicated"
+    assert replica_client.get(f"/api/memos/{memo['id']}").status_code == 200
+    assert memo_cache.get(f"memos:list:{DEFAULT_PAGE_SIZE}:") is not None
+    assert memo_cache.get(f"memos:item:{memo['id']}") is not None
+
+    time.sleep(0.3)
+    assert memo_cache.get(f"memos:list:{DEFAULT_PAGE_SIZE}:") is None
+    assert memo_cache.get(f"memos:item:{memo['id']}") is None
+
+
+def test_list_returns_previews(setup_database):
+    """Test list responses carry a content preview instead of the full body."""
+    long_content = "가" * 500
+    client.post("/api/memos", json={"title": "Long", "content": long_content})
+    client.post("/api/memos", json={"title": "Short", "content": "brief"})
+    client.post("/api/memos", json={"title": "Empty"})
+
+    items = {item["title"]: item for item in client.get("/api/memos").json()["items"]}
+    assert "content" not in items["Long"]
+    assert items["Long"]["preview"] == long_content[:200]
+    assert items["Long"]["truncated"] is True
+    assert items["Short"]["preview"] == "brief"
+    assert items["Short"]["truncated"] is False
+    assert items["Empty"]["preview"] is None
+    assert items["Empty"]["truncated"] is False
+
+
+def test_get_memo(setup_database):
+    """Test fetching one memo returns its full content, with ETag revalidation."""
+    long_content = "x" * 5000
+    memo_id = client.post("/api/memos", json={"title": "Long", "content": long_content}).json()["id"]
+
+    response = client.get(f"/api/memos/{memo_id}")
+    assert response.status_code == 200
+    assert response.json()["content"] == long_content
+    not_modified = client.get(f"/api/memos/{memo_id}", headers={"If-None-Match": response.headers["etag"]})
+    assert not_modified.status_code == 304
+
+    client.delete(f"/api/memos/{memo_id}")
+    assert client.get(f"/api/memos/{memo_id}").status_code == 404
+
+
+def test_export_memos(setup_database, monkeypatch):
+    """Test the export streams every memo as NDJSON in id order across chunks."""
+    import json
+    from app.routers import memos
+
+    monkeypatch.setattr(memos, "EXPORT_CHUNK_SIZE", 2)
+    client.post("/api/memos/bulk", json={"items": [
+        {"title": f"Memo {i}", "content": "줄\n바꿈\t탭" if i == 0 else None} for i in range(5)
+    ]})
+
+    response = client.get("/api/memos/export")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [m["title"] for m in lines] == [f"Memo {i}" for i in range(5)]
+    assert [m["id"] for m in lines] == sorted(m["id"] for m in lines)
+    assert lines[0]["content"] == "줄\n바꿈\t탭"
+    assert lines[1]["content"] is None
+
+
+def test_create_memo_with_write_batching(setup_database, monkeypatch):
+    """Test creates made through the write batcher return their own rows."""
+    from app.routers import memos
+
+    monkeypatch.setattr(memos, "MEMO_WRITE_BATCHING", True)
+    monkeypatch.setattr(memos.create_batcher, "session_factory", TestingSessionLocal)
+    created = client.post("/api/memos", json={"title": "Batched", "content": "Test"})
+    assert created.status_code == 201
+    assert created.json()["title"] == "Batched"
+    assert memos.create_batcher.items >= 1
+    assert [m["id"] for m in client.get("/api/memos").json()["items"]] == [created.json()["id"]]
+
+
+def test_delete_is_soft_until_purged(setup_database):
+    """Test deleted memos disappear from every read but keep their row for the purge."""
+    from app.models import Memo
+
+    memo_id = client.post("/api/memos", json={"title": "milk", "content": "milk"}).json()["id"]
+    assert client.delete(f"/api/memos/{memo_id}").status_code == 204
+
+    assert client.get("/api/memos").json()["items"] == []
+    assert client.get("/api/memos/search", params={"q": "milk"}).json()["items"] == []
+    assert client.get(f"/api/memos/{memo_id}").status_code == 404
+    assert client.get("/api/memos/export").text == ""
+    assert client.delete(f"/api/memos/{memo_id}").status_code == 404
+    with TestingSessionLocal() as db:
+        assert db.get(Memo, memo_id).deleted_at is not None
@@ -0,0 +1,67 @@
+"""Tests for Prometheus metrics."""
+import os
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from app.main import app
+from app.metrics import Counter, Histogram
+from app.profiling import RequestDBStats, current_db_stats, instrument_engine
+
+client = TestClient(app)
+
+
+def test_histogram_render():
+    """Test histogram buckets are cumulative and labelled."""
+    histogram = Histogram("test_seconds", "Test histogram", ("route",), buckets=(0.1, 1.0))
+    histogram.observe("/a", value=0.05)
+    histogram.observe("/a", value=0.5)
+    histogram.observe("/a", value=5)
+    lines = histogram.render()
+    assert 'test_seconds_bucket{route="/a",le="0.1"} 1' in lines
+    assert 'test_seconds_bucket{route="/a",le="1.0"} 2' in lines
+    assert 'test_seconds_bucket{route="/a",le="+Inf"} 3' in lines
+    assert 'test_seconds_count{route="/a"} 3' in lines
+
+
+def test_counter_render():
+    """Test counters render with HELP and TYPE lines."""
+    counter = Counter("test_total", "Test counter")
+    counter.inc(amount=2)
+    assert counter.render() == ["# HELP test_total Test counter", "# TYPE test_total counter", "test_total 2.0"]
+
+
+def test_metrics_endpoint_records_route_template():
+    """Test requests are recorded by route template and exposed at /metrics."""
+    client.get("/api/health")
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert 'http_request_duration_seconds_count{method="GET",route="/api/health",status="200"}' in body
+    assert "http_requests_in_flight" in body
+    assert 'db_pool_connections{state="checked_out"}' in body
+
+
+def test_module_collectors_are_exposed():
+    """Test event stream, write batching and purge modules register their own metrics."""
+    body = client.get("/metrics").text
+    for name in ("memo_events_clients", "memo_write_batches_total", "memo_purged_total", "memo_purge_lag_seconds"):
+        assert f"# TYPE {name} " in body
+
+
+@pytest.mark.skipif(not os.getenv("TEST_DATABASE_URL"), reason="TEST_DATABASE_URL is required")
+def test_engine_events_accumulate_request_db_time():
+    """Test statements on an instrumented engine count toward the current request."""
+    engine = create_engine(os.getenv("TEST_DATABASE_URL"))
+    instrument_engine(engine)
+    stats = RequestDBStats()
+    token = current_db_stats.set(stats)
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT 2"))
+    finally:
+        current_db_stats.reset(token)
+        engine.dispose()
+    assert stats.queries == 2
+    assert stats.seconds > 0
@@ -0,0 +1,116 @@
+"""Tests for versioned schema migrations."""
+import os
+import pytest
+from sqlalchemy import create_engine, inspect, text
+from app.migrations import (
+    LATEST_VERSION,
+    MIGRATION_LOCK_KEY,
+    MigrationLockError,
+    SchemaVersionError,
+    current_version,
+    ensure_schema,
+    migrate,
+)
+
+TEST_DB_URL = os.getenv("TEST_DATABASE_URL")
+if not TEST_DB_URL:
+    pytest.skip("TEST_DATABASE_URL environment variable is required for database tests", allow_module_level=True)
+
+
+@pytest.fixture
+def engine():
+    """Engine on an empty test database, cleaned up afterwards."""
+    engine = create_engine(TEST_DB_URL)
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE IF EXISTS memos, schema_version"))
+    yield engine
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE IF EXISTS memos, schema_version"))
+    engine.dispose()
+
+
+def test_migrate_creates_schema_and_indexes(engine):
+    """Test migrating an empty database applies every version once."""
+    assert current_version(engine) == 0
+    assert migrate(engine) == list(range(1, LATEST_VERSION + 1))
+    assert current_version(engine) == LATEST_VERSION
+    assert migrate(engine) == []
+
+    indexes = {index["name"] for index in inspect(engine).get_indexes("memos")}
+    assert {"ix_memos_live_created_at_id", "ix_memos_live_search", "ix_memos_deleted_at"} <= indexes
+    # Kept for tasks still running during a rolling deploy
+    assert {"ix_memos_created_at_id", "ix_memos_search"} <= indexes
+    with engine.connect() as conn:
+        invalid = conn.execute(text(
+            "SELECT count(*) FROM pg_index i JOIN pg_class c ON c.oid = i.indrelid "
+            "WHERE c.relname = 'memos' AND NOT i.indisvalid"
+        )).scalar()
+    assert invalid == 0
+
+
+def test_ensure_schema_only_verifies_when_not_applying(engine):
+    """Test a stale schema fails verification unless migrations may be applied."""
+    migrate(engine, target=1)
+    with pytest.raises(SchemaVersionError):
+        ensure_schema(engine, apply_pending=False)
+    assert ensure_schema(engine) == LATEST_VERSION
+    assert ensure_schema(engine, apply_pending=False) == LATEST_VERSION
+
+
+def test_migrate_adopts_tables_from_create_all(engine):
+    """Test databases created by the old create_all startup migrate cleanly."""
+    from app.database import Base
+    import app.models  # noqa: F401
+
+    Base.metadata.create_all(bind=engine)
+    assert migrate(engine) == list(range(1, LATEST_VERSION + 1))
+
+
+def test_migrate_waits_for_lock_without_blocking(engine, monkeypatch):
+    """Test a second run polls for the migration lock instead of blocking in pg_advisory_lock."""
+    from app import migrations
+
+    monkeypatch.setattr(migrations, "MIGRATION_LOCK_POLL", 0.05)
+    with engine.connect() as holder:
+        holder.execute(text("SELECT pg_advisory_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+        with pytest.raises(MigrationLockError):
+            migrate(engine, lock_wait=0.2)
+        holder.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATION_LOCK_KEY})
+        holder.commit()
+    assert migrate(engine) == list(range(1, LATEST_VERSION + 1))
+
+
+def test_migrate_retries_ddl_blocked_by_long_transaction(engine, monkeypatch):
+    """Test DDL gives up its lock wait behind an open reader and succeeds on a later attempt."""
+    import threading
+    from app import migrations
+
+    monkeypatch.setattr(migrations, "DDL_LOCK_TIMEOUT", "100ms")
+    monkeypatch.setattr(migrations, "DDL_RETRY_DELAY", 0.1)
+    migrate(engine, target=4)
+
+    # An open transaction that has read memos, like a streaming export
+    reader = engine.connect()
+    reader.execute(text("SELECT count(*) FROM memos"))
+    threading.Timer(0.3, reader.close).start()
+
+    assert migrate(engine, target=5) == [5]
+    columns = {column["name"] for column in inspect(engine).get_columns("memos")}
+    assert "deleted_at" in columns
+
+
+def test_concurrent_index_build_waits_for_long_transaction(engine, monkeypatch, capsys):
+    """Test a concurrent index build outwaits an open transaction instead of timing out and retrying."""
+    import threading
+    from app import migrations
+
+    monkeypatch.setattr(migrations, "DDL_LOCK_TIMEOUT", "100ms")
+    migrate(engine, target=5)
+
+    # A snapshot held open, like the streaming export's REPEATABLE READ transaction
+    reader = engine.connect().execution_options(isolation_level="REPEATABLE READ")
+    reader.execute(text("SELECT count(*) FROM memos"))
+    threading.Timer(0.5, reader.close).start()
+
+    assert migrate(engine, target=6) == [6]
+    assert "retrying" not in capsys.readouterr().out
@@ -0,0 +1,52 @@
+"""Tests for SQL profiling and the slow-query log."""
+import logging
+import os
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from app.profiling import SQLProfilingMiddleware, current_db_stats, instrument_engine
+
+app = FastAPI()
+app.add_middleware(SQLProfilingMiddleware, allow_header=True)
+
+
+@app.get("/work")
+async def work():
+    stats = current_db_stats.get()
+    stats.queries += 2
+    stats.seconds += 0.0125
+    return {"ok": True}
+
+
+client = TestClient(app)
+
+
+def test_server_timing_on_profiled_request():
+    """Test the profiling header reports query count and DB time."""
+    response = client.get("/work", headers={"X-SQL-Profile": "1"})
+    assert response.headers["server-timing"] == 'db;dur=12.50;desc="2 queries"'
+
+
+def test_no_server_timing_without_header():
+    """Test unprofiled requests carry no profiling header."""
+    response = client.get("/work")
+    assert "server-timing" not in response.headers
+
+
+@pytest.mark.skipif(not os.getenv("TEST_DATABASE_URL"), reason="TEST_DATABASE_URL is required")
+def test_slow_query_logged(caplog):
+    """Test statements over the threshold are logged without parameters."""
+    engine = create_engine(os.getenv("TEST_DATABASE_URL"))
+    instrument_engine(engine, slow_query_threshold_ms=10)
+    try:
+        with caplog.at_level(logging.WARNING, logger="app.sql"):
+            with engine.connect() as conn:
+                conn.execute(text("SELECT pg_sleep(0.02), :secret"), {"secret": "hidden"})
+                conn.execute(text("SELECT 1"))
+    finally:
+        engine.dispose()
+    messages = [r.getMessage() for r in caplog.records if r.name == "app.sql"]
+    assert len(messages) == 1
+    assert "Slow query" in messages[0] and "pg_sleep" in messages[0]
+    assert "hidden" not in messages[0]
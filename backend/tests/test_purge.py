@@ -0,0 +1,45 @@
+"""Tests for the background purge of soft-deleted memos."""
+import os
+import pytest
+from sqlalchemy import create_engine, func, insert, select, text
+from app.database import Base
+from app.models import Memo
+from app.purge import MemoPurger
+
+TEST_DB_URL = os.getenv("TEST_DATABASE_URL")
+if not TEST_DB_URL:
+    pytest.skip("TEST_DATABASE_URL environment variable is required for database tests", allow_module_level=True)
+
+
+@pytest.fixture
+def engine():
+    """Engine on a test database with the memos table, dropped afterwards."""
+    engine = create_engine(TEST_DB_URL)
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+
+
+def test_purge_removes_old_soft_deletes_in_batches(engine):
+    """Test memos soft-deleted before the delay are purged in batches, and the backlog is measured."""
+    with engine.begin() as conn:
+        conn.execute(insert(Memo), [{"title": f"Memo {i}"} for i in range(8)])
+        # Five deleted an hour ago, one just now, two live
+        conn.execute(text(
+            "UPDATE memos SET deleted_at = now() - interval '1 hour' "
+            "WHERE id IN (SELECT id FROM memos ORDER BY id LIMIT 5)"
+        ))
+        conn.execute(text("UPDATE memos SET deleted_at = now() WHERE id = (SELECT max(id) FROM memos)"))
+
+    purger = MemoPurger(lambda: engine, batch_size=2, delay=60)
+    purger.measure_backlog()
+    assert purger.pending == 6
+    assert purger.lag_seconds >= 3600
+
+    assert purger.run_once() == 5
+    assert purger.batches == 3
+    assert purger.pending == 1
+    assert purger.lag_seconds < 60
+    with engine.connect() as conn:
+        assert conn.execute(select(func.count()).select_from(Memo)).scalar() == 3
@@ -0,0 +1,35 @@
+"""Tests for side-effect-free application import."""
+import os
+import subprocess
+import sys
+from app.startup import StartupTimer
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_importing_app_does_not_resolve_credentials():
+    """Test importing the app neither loads boto3 nor creates the engine."""
+    code = (
+        "import sys\n"
+        "import app.main\n"
+        "from app import database\n"
+        "assert 'boto3' not in sys.modules\n"
+        "assert database._settings is None\n"
+        "assert database._engine is None\n"
+    )
+    env = dict(os.environ, USE_AWS_SECRETS="true")
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=BACKEND_DIR, env=env, capture_output=True, text=True
+    )
+    assert result.returncode == 0, result.stderr
+
+
+def test_startup_timer_report():
+    """Test the report lists every timed phase."""
+    timer = StartupTimer()
+    with timer.phase("schema"):
+        pass
+    timer.phases["import"] = 12.0
+    report = timer.report()
+    assert "schema:" in report
+    assert "import: 12.0ms" in report
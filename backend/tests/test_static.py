@@ -0,0 +1,66 @@
+"""Tests for SPA static file serving."""
+import gzip
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from app.static import IMMUTABLE_CACHE_CONTROL, PrecompressedStaticFiles, SPAIndex
+
+SCRIPT = b"console.log('memo');" * 100
+
+
+@pytest.fixture
+def client(tmp_path):
+    """App serving a fake Vite build output."""
+    assets = tmp_path / "assets"
+    assets.mkdir()
+    (assets / "index-abc123.js").write_bytes(SCRIPT)
+    (assets / "index-abc123.js.gz").write_bytes(gzip.compress(SCRIPT))
+    (assets / "plain-def456.css").write_bytes(b"body{}")
+    (tmp_path / "index.html").write_bytes(b"<html>memo</html>")
+
+    app = FastAPI()
+    app.mount("/assets", PrecompressedStaticFiles(directory=str(assets)), name="assets")
+    spa_index = SPAIndex(str(tmp_path / "index.html"))
+
+    @app.get("/")
+    async def serve_root(request: Request):
+        return spa_index.response(request.headers)
+
+    return TestClient(app)
+
+
+def test_asset_precompressed_variant(client):
+    """Test a .gz sibling is served with immutable caching."""
+    response = client.get("/assets/index-abc123.js", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["content-type"].startswith("text/javascript") or \
+        response.headers["content-type"].startswith("application/javascript")
+    assert response.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+    assert response.content == SCRIPT
+
+
+def test_asset_identity_when_not_accepted(client):
+    """Test the original file is served to clients without gzip."""
+    response = client.get("/assets/index-abc123.js", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert response.content == SCRIPT
+
+
+def test_asset_conditional_request(client):
+    """Test a matching If-None-Match yields 304."""
+    first = client.get("/assets/plain-def456.css")
+    assert first.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+    second = client.get(
+        "/assets/plain-def456.css", headers={"If-None-Match": first.headers["etag"]}
+    )
+    assert second.status_code == 304
+
+
+def test_index_served_from_memory(client):
+    """Test index.html is served with an ETag and revalidated with 304."""
+    first = client.get("/")
+    assert first.content == b"<html>memo</html>"
+    assert first.headers["cache-control"] == "no-cache"
+    second = client.get("/", headers={"If-None-Match": first.headers["etag"]})
+    assert second.status_code == 304
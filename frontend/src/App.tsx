@@ -1,20 +1,41 @@
 import { useState, useEffect } from 'react';
 import { memoService } from './services/api';
-import type { Memo, MemoCreate } from './types';
+import type { Memo, MemoCreate, MemoSummary } from './types';
 import MemoList from './components/MemoList';
 import MemoForm from './components/MemoForm';
 
+// Newest first, matching the API's (created_at, id) order
+const byNewest = (a: MemoSummary, b: MemoSummary) =>
+  b.created_at.localeCompare(a.created_at) || b.id - a.id;
+
+// Add memos not already shown; events may repeat what this tab just created
+const mergeMemos = (current: MemoSummary[], added: MemoSummary[]) => {
+  const known = new Set(current.map((memo) => memo.id));
+  const fresh = added.filter((memo) => !known.has(memo.id));
+  return fresh.length ? [...fresh, ...current].sort(byNewest) : current;
+};
+
+// A memo this tab just created is shown in full
+const toSummary = ({ content, ...memo }: Memo): MemoSummary => ({
+  ...memo,
+  preview: content,
+  truncated: false,
+});
+
 function App() {
-  const [memos, setMemos] = useState<Memo[]>([]);
+  const [memos, setMemos] = useState<MemoSummary[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState<string | null>(null);
 
   const loadMemos = async () => {
     try {
       setLoading(true);
       setError(null);
-      const data = await memoService.getMemos();
-      setMemos(data);
+      const page = await memoService.getMemos();
+      setMemos(page.items);
+      setNextCursor(page.next_cursor);
     } catch (err) {
       setError('메모를 불러오는데 실패했습니다.');
       console.error(err);
@@ -23,14 +44,38 @@ function App() {
     }
   };
 
+  const loadMoreMemos = async () => {
+    if (!nextCursor) return;
+    try {
+      setLoadingMore(true);
+      setError(null);
+      const page = await memoService.getMemos(nextCursor);
+      setMemos((prev) => [...prev, ...page.items]);
+      setNextCursor(page.next_cursor);
+    } catch (err) {
+      setError('메모를 불러오는데 실패했습니다.');
+      console.error(err);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   useEffect(() => {
     loadMemos();
+    return memoService.subscribeToChanges({
+      onCreated: (created) => setMemos((prev) => mergeMemos(prev, created)),
+      onDeleted: (ids) => {
+        const removed = new Set(ids);
+        setMemos((prev) => prev.filter((memo) => !removed.has(memo.id)));
+      },
+      onReset: () => loadMemos(),
+    });
   }, []);
 
   const handleCreateMemo = async (memo: MemoCreate) => {
     try {
-      await memoService.createMemo(memo);
-      await loadMemos();
+      const created = await memoService.createMemo(memo);
+      setMemos((prev) => mergeMemos(prev, [toSummary(created)]));
     } catch (err) {
       setError('메모를 생성하는데 실패했습니다.');
       console.error(err);
@@ -40,7 +85,7 @@ function App() {
   const handleDeleteMemo = async (id: number) => {
     try {
       await memoService.deleteMemo(id);
-      await loadMemos();
+      setMemos((prev) => prev.filter((memo) => memo.id !== id));
     } catch (err) {
       setError('메모를 삭제하는데 실패했습니다.');
       console.error(err);
@@ -65,7 +110,20 @@ function App() {
         {loading ? (
           <div className="text-center py-8 text-gray-600">로딩 중...</div>
         ) : (
-          <MemoList memos={memos} onDelete={handleDeleteMemo} />
+          <>
+            <MemoList memos={memos} onDelete={handleDeleteMemo} />
+            {nextCursor && (
+              <div className="text-center mt-6">
+                <button
+                  onClick={loadMoreMemos}
+                  disabled={loadingMore}
+                  className="px-4 py-2 bg-white border border-gray-300 rounded-md text-gray-700 hover:bg-gray-100 disabled:opacity-50 transition-colors"
+                >
+                  {loadingMore ? '로딩 중...' : '더 보기'}
+                </button>
+              </div>
+            )}
+          </>
         )}
       </div>
     </div>
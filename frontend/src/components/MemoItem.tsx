@@ -1,11 +1,29 @@
-import type { Memo } from '../types';
+import { useState } from 'react';
+import { memoService } from '../services/api';
+import type { MemoSummary } from '../types';
 
 interface MemoItemProps {
-  memo: Memo;
+  memo: MemoSummary;
   onDelete: (id: number) => void;
 }
 
 export default function MemoItem({ memo, onDelete }: MemoItemProps) {
+  const [fullContent, setFullContent] = useState<string | null>(null);
+  const [expanding, setExpanding] = useState(false);
+
+  // The list only carries a preview; load the full text on demand
+  const handleExpand = async () => {
+    try {
+      setExpanding(true);
+      const full = await memoService.getMemo(memo.id);
+      setFullContent(full.content);
+    } catch (err) {
+      console.error(err);
+    } finally {
+      setExpanding(false);
+    }
+  };
+
   const handleDelete = () => {
     if (window.confirm('정말 이 메모를 삭제하시겠습니까?')) {
       onDelete(memo.id);
@@ -35,8 +53,19 @@ export default function MemoItem({ memo, onDelete }: MemoItemProps) {
           삭제
         </button>
       </div>
-      {memo.content && (
-        <p className="text-gray-700 mb-3 whitespace-pre-wrap">{memo.content}</p>
+      {memo.preview && (
+        <p className="text-gray-700 mb-3 whitespace-pre-wrap">
+          {fullContent ?? (memo.truncated ? `${memo.preview}…` : memo.preview)}
+        </p>
+      )}
+      {memo.truncated && fullContent === null && (
+        <button
+          onClick={handleExpand}
+          disabled={expanding}
+          className="text-sm text-blue-600 hover:text-blue-800 mb-3 disabled:opacity-50"
+        >
+          {expanding ? '불러오는 중...' : '전체 보기'}
+        </button>
       )}
       <p className="text-sm text-gray-500">
         작성일: {formatDate(memo.created_at)}
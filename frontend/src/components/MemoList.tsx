@@ -1,8 +1,8 @@
-import type { Memo } from '../types';
+import type { MemoSummary } from '../types';
 import MemoItem from './MemoItem';
 
 interface MemoListProps {
-  memos: Memo[];
+  memos: MemoSummary[];
   onDelete: (id: number) => void;
 }
 
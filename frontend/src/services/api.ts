@@ -1,19 +1,49 @@
 import axios from 'axios';
-import type { Memo, MemoCreate } from '../types';
+import type { Memo, MemoChangeHandlers, MemoCreate, MemoPage } from '../types';
 
 // Use relative path when served from same server, otherwise use env variable
 const API_BASE_URL = (import.meta as any).env?.VITE_API_BASE_URL || '';
 
 const api = axios.create({
   baseURL: API_BASE_URL,
+  // Sends the read-your-writes cookie, so reads right after a write see it
+  withCredentials: true,
   headers: {
     'Content-Type': 'application/json',
   },
 });
 
+// Last page seen per cursor, revalidated with If-None-Match
+const pageCache = new Map<string, { etag: string; page: MemoPage }>();
+
 export const memoService = {
-  async getMemos(): Promise<Memo[]> {
-    const response = await api.get<Memo[]>('/api/memos');
+  async getMemos(cursor?: string | null): Promise<MemoPage> {
+    const cacheKey = cursor ?? '';
+    const cached = pageCache.get(cacheKey);
+    const response = await api.get<MemoPage>('/api/memos', {
+      params: cursor ? { cursor } : undefined,
+      headers: cached ? { 'If-None-Match': cached.etag } : undefined,
+      validateStatus: (status) => (status >= 200 && status < 300) || status === 304,
+    });
+    if (response.status === 304 && cached) {
+      return cached.page;
+    }
+    const etag = response.headers['etag'];
+    if (etag) {
+      pageCache.set(cacheKey, { etag, page: response.data });
+    }
+    return response.data;
+  },
+
+  async searchMemos(q: string, cursor?: string | null): Promise<MemoPage> {
+    const response = await api.get<MemoPage>('/api/memos/search', {
+      params: cursor ? { q, cursor } : { q },
+    });
+    return response.data;
+  },
+
+  async getMemo(id: number): Promise<Memo> {
+    const response = await api.get<Memo>(`/api/memos/${id}`);
     return response.data;
   },
 
@@ -25,5 +55,19 @@ export const memoService = {
   async deleteMemo(id: number): Promise<void> {
     await api.delete(`/api/memos/${id}`);
   },
+
+  // Live memo changes from other tabs and users; returns a function that closes the stream
+  subscribeToChanges(handlers: MemoChangeHandlers): () => void {
+    const source = new EventSource(`${API_BASE_URL}/api/memos/stream`, { withCredentials: true });
+    source.addEventListener('created', (event) => {
+      handlers.onCreated(JSON.parse((event as MessageEvent).data).memos);
+    });
+    source.addEventListener('deleted', (event) => {
+      handlers.onDeleted(JSON.parse((event as MessageEvent).data).ids);
+    });
+    // Changes were missed and can't be replayed; the list must be reloaded
+    source.addEventListener('reset', () => handlers.onReset());
+    return () => source.close();
+  },
 };
 
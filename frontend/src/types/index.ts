@@ -11,3 +11,24 @@ export interface MemoCreate {
   content?: string | null;
 }
 
+
+// List item: content is cut to a preview; fetch the memo for the full text
+export interface MemoSummary {
+  id: number;
+  title: string;
+  preview: string | null;
+  truncated: boolean;
+  created_at: string;
+  updated_at: string;
+}
+
+export interface MemoPage {
+  items: MemoSummary[];
+  next_cursor: string | null;
+}
+
+export interface MemoChangeHandlers {
+  onCreated: (memos: MemoSummary[]) => void;
+  onDeleted: (ids: number[]) => void;
+  onReset: () => void;
+}
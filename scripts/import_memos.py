@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""Import memos from NDJSON (as written by GET /api/memos/export) using COPY."""
+import argparse
+import io
+import json
+import os
+import sys
+import time
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../backend'))
+
+from app.database import get_engine
+
+DEFAULT_BATCH_SIZE = 5000
+COLUMNS = ("id", "title", "content", "created_at", "updated_at")
+
+
+def _copy_value(value):
+    """Encode one value in COPY text format."""
+    if value is None:
+        return "\\N"
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def _copy_row(memo: dict) -> str:
+    if not memo.get("title"):
+        raise ValueError("memo has no title")
+    return "\t".join(_copy_value(memo.get(column)) for column in COLUMNS) + "\n"
+
+
+def _read_batches(stream, batch_size: int):
+    """Yield (COPY buffer, row count, byte count) per ``batch_size`` lines."""
+    buffer, rows, size = io.StringIO(), 0, 0
+    for line_number, line in enumerate(stream, 1):
+        size += len(line.encode("utf-8"))
+        if not line.strip():
+            continue
+        try:
+            buffer.write(_copy_row(json.loads(line)))
+        except ValueError as e:
+            raise ValueError(f"line {line_number} ({e}); earlier batches were committed") from e
+        rows += 1
+        if rows == batch_size:
+            buffer.seek(0)
+            yield buffer, rows, size
+            buffer, rows, size = io.StringIO(), 0, 0
+    if rows:
+        buffer.seek(0)
+        yield buffer, rows, size
+
+
+def import_memos(stream, batch_size: int = DEFAULT_BATCH_SIZE, keep_ids: bool = False) -> int:
+    """
+    COPY memos into a staging table and insert them, one transaction per batch.
+
+    Missing timestamps default to now(). With ``keep_ids`` memos keep their
+    exported ids and rows whose id already exists are skipped; otherwise
+    every memo gets a new id. Imports bypass the API, so cached list pages
+    catch up after MEMO_CACHE_TTL and open clients on their next reload.
+
+    Returns:
+        Number of memos inserted
+    """
+    id_column = "id, " if keep_ids else ""
+    insert_sql = (
+        f"INSERT INTO memos ({id_column}title, content, created_at, updated_at) "
+        f"SELECT {id_column}title, content, coalesce(created_at, now()), "
+        "coalesce(updated_at, created_at, now()) FROM memo_import ORDER BY id"
+        + (" ON CONFLICT (id) DO NOTHING" if keep_ids else "")
+    )
+
+    connection = get_engine().raw_connection()
+    inserted = total_rows = total_bytes = 0
+    started = time.perf_counter()
+    try:
+        cursor = connection.cursor()
+        # Temporary tables skip the WAL; rows are cleared at each commit
+        cursor.execute(
+            "CREATE TEMPORARY TABLE memo_import ("
+            "id INTEGER, title VARCHAR(255), content TEXT, "
+            "created_at TIMESTAMP WITHOUT TIME ZONE, updated_at TIMESTAMP WITHOUT TIME ZONE"
+            ") ON COMMIT DELETE ROWS"
+        )
+        connection.commit()
+
+        for buffer, rows, size in _read_batches(stream, batch_size):
+            cursor.copy_expert(f"COPY memo_import ({', '.join(COLUMNS)}) FROM STDIN", buffer)
+            cursor.execute(insert_sql)
+            inserted += cursor.rowcount
+            connection.commit()
+
+            total_rows += rows
+            total_bytes += size
+            elapsed = time.perf_counter() - started
+            print(
+                f"   {total_rows:>10} rows  {total_rows / elapsed:>10.0f} rows/s  "
+                f"{total_bytes / elapsed / 1e6:>7.2f} MB/s"
+            )
+
+        if keep_ids:
+            # Keep new memos from colliding with the imported ids
+            cursor.execute(
+                "SELECT setval(pg_get_serial_sequence('memos', 'id'), "
+                "greatest((SELECT max(id) FROM memos), 1))"
+            )
+            connection.commit()
+    finally:
+        connection.close()
+
+    elapsed = time.perf_counter() - started
+    skipped = total_rows - inserted
+    print(f"✅ Imported {inserted} memos in {elapsed:.2f}s ({inserted / max(elapsed, 1e-9):.0f} rows/s)")
+    if skipped:
+        print(f"⚠️  Skipped {skipped} memos whose id already exists")
+    return inserted
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("file", help="NDJSON file to import, or - for stdin")
+    parser.add_argument(
+        "--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+        help=f"rows per COPY and transaction (default {DEFAULT_BATCH_SIZE})"
+    )
+    parser.add_argument(
+        "--keep-ids", action="store_true",
+        help="keep exported ids, skipping memos whose id already exists"
+    )
+    args = parser.parse_args(argv)
+
+    print("=" * 60)
+    print("Importing Memos")
+    print("=" * 60)
+    stream = sys.stdin if args.file == "-" else open(args.file, encoding="utf-8")
+    try:
+        import_memos(stream, args.batch_size, args.keep_ids)
+    except ValueError as e:
+        print(f"❌ Invalid input, stopped before {e}")
+        return 1
+    except Exception as e:
+        print(f"❌ Error importing memos: {e}")
+        return 1
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())